@@ -1,7 +1,6 @@
-import inspect
-
 from . import _LOGGER
 from .const import TEXT_UNKNOWN, WISERSYSTEM
+from .helpers.tracing import caller_name
 from .rest_controller import _WiserRestController
 
 
@@ -20,9 +19,7 @@ class _WiserAutomation:
         """
         result = await self._wiser_rest_controller._send_command(WISERSYSTEM, cmd)
         if result:
-            _LOGGER.debug(
-                "Wiser hub - %s command successful", format(inspect.stack()[1].function)
-            )
+            _LOGGER.debug("Wiser hub - %s command successful", caller_name())
             return True
         return False
 
@@ -2,13 +2,13 @@
 Handles binary_sensor devices
 """
 
-import inspect
 
 from aioWiserHeatAPI import _LOGGER
 
 from .helpers.battery import _WiserBattery
 from .helpers.device import _WiserDevice
 from .helpers.threshold import _WiserThresholdSensor
+from .helpers.tracing import caller_name
 
 
 class _WiserBinarySensor(_WiserDevice):
@@ -31,11 +31,7 @@ class _WiserBinarySensor(_WiserDevice):
         if result:
             self._device_type_data = result
         if result:
-            _LOGGER.debug(
-                "Wiser light - {} command successful".format(
-                    inspect.stack()[1].function
-                )
-            )
+            _LOGGER.debug("Wiser light - %s command successful", caller_name())
             return True
         return False
 
@@ -1,18 +1,39 @@
 import argparse
+import asyncio
 import json
 import logging
+import math
 import pathlib
-from sys import version_info
+import time
+from datetime import datetime
 
-from . import __VERSION__
+from aioWiserHeatAPI.rest_controller import _WiserConnectionInfo, _WiserRestController
 
-from .const import WISERHUBDOMAIN, WISERHUBNETWORK, WISERHUBSCHEDULES
+from . import __VERSION__
+from .const import (
+    MONITOR_INTERVAL,
+    POLL_MAX_INTERVAL,
+    POLL_MIN_INTERVAL,
+    WISERHUBDOMAIN,
+    WISERHUBNETWORK,
+    WISERHUBSCHEDULES,
+    WISERROOM,
+)
 from .exceptions import (
     WiserHubAuthenticationError,
     WiserHubConnectionError,
     WiserHubRESTError,
 )
-from aioWiserHeatAPI.rest_controller import _WiserConnectionInfo, _WiserRestController
+from .helpers.anonymise import anonymise_data
+from .helpers.mock_hub import _WiserMockHub
+from .helpers.schedule_codec import yaml_dump, yaml_load
+from .helpers.tracing import WiserInMemorySpanExporter
+
+OUTPUT_ENDPOINTS = {
+    "domain": WISERHUBDOMAIN,
+    "network": WISERHUBNETWORK,
+    "schedule": WISERHUBSCHEDULES,
+}
 
 
 def main_parser() -> argparse.ArgumentParser:
@@ -38,34 +59,124 @@ def main_parser() -> argparse.ArgumentParser:
     )
     _add_default_arguments(output_parser)
     output_parser.add_argument(
-        "type", help="What to output. Possible values are domain/network/schedule/all"
+        "type",
+        choices=[*OUTPUT_ENDPOINTS, "all"],
+        help="What to output. Possible values are domain/network/schedule/all",
     )
     output_parser.set_defaults(func=output_json)
 
+    bench_parser = subparsers.add_parser(
+        "bench",
+        description="Measure poll, build and command times against a hub or mock hub",
+    )
+    bench_parser.add_argument(
+        "-n",
+        "--polls",
+        dest="polls",
+        type=int,
+        default=10,
+        help="(optional) Number of polls to time",
+    )
+    bench_parser.add_argument(
+        "-c",
+        "--commands",
+        dest="commands",
+        type=int,
+        default=0,
+        help="(optional) Number of commands to time.  Sends the first room its current name.  Only timed against a mock hub or replay unless --commands-on-hub is given",
+    )
+    bench_parser.add_argument(
+        "--commands-on-hub",
+        dest="commands_on_hub",
+        action="store_true",
+        help="(optional) Allow timing commands against a hub.  Commands change hub configuration",
+    )
+    bench_parser.add_argument(
+        "-y",
+        "--schedule-codec",
+        dest="schedule_codec",
+        type=int,
+        default=0,
+        help="(optional) Number of times to round trip each schedule through yaml and webservice formats",
+    )
+    bench_parser.add_argument(
+        "-j",
+        "--json",
+        dest="json",
+        action="store_true",
+        help="(optional) Output results as a single line of json",
+    )
+    _add_hub_or_mock_arguments(bench_parser)
+    bench_parser.set_defaults(func=bench)
+
+    monitor_parser = subparsers.add_parser(
+        "monitor",
+        description="Poll hub and output changed entity fields as json lines",
+    )
+    monitor_parser.add_argument(
+        "-i",
+        "--interval",
+        dest="interval",
+        type=float,
+        default=MONITOR_INTERVAL,
+        help=f"(optional) Seconds between first polls.  Default is {MONITOR_INTERVAL}",
+    )
+    monitor_parser.add_argument(
+        "--min-interval",
+        dest="min_interval",
+        type=float,
+        default=POLL_MIN_INTERVAL,
+        help=f"(optional) Seconds between polls after changes.  Default is {POLL_MIN_INTERVAL}",
+    )
+    monitor_parser.add_argument(
+        "--max-interval",
+        dest="max_interval",
+        type=float,
+        default=POLL_MAX_INTERVAL,
+        help=f"(optional) Most seconds between polls when nothing changes.  Default is {POLL_MAX_INTERVAL}",
+    )
+    monitor_parser.add_argument(
+        "-n",
+        "--polls",
+        dest="polls",
+        type=int,
+        default=0,
+        help="(optional) Number of polls before stopping.  Default is to run until stopped",
+    )
+    monitor_parser.add_argument(
+        "-r",
+        "--record",
+        dest="record",
+        help="(optional) File to record anonymised hub responses to for replay",
+    )
+    _add_hub_or_mock_arguments(monitor_parser)
+    monitor_parser.set_defaults(func=monitor)
+
     version_parser = subparsers.add_parser("version", description="Show api version")
     version_parser.set_defaults(func=show_version)
 
     return parser
 
 
-def output_json(args) -> None:
+async def output_json(args) -> None:
     c = _WiserConnectionInfo()
     c.host = args.hostname
     c.secret = args.secret
+    c.port = args.port
 
-    wiser_rest_controller = _WiserRestController(c)
+    wiser_rest_controller = _WiserRestController(wiser_connection_info=c)
+    output_types = list(OUTPUT_ENDPOINTS) if args.type == "all" else [args.type]
 
     # Read data from hub
     try:
-        if args.type == "domain" or args.type == "all":
-            domain_data = wiser_rest_controller._get_hub_data(WISERHUBDOMAIN)
-            log_response_to_file(domain_data, "domain", args.raw)
-        if args.type == "network" or args.type == "all":
-            network_data = wiser_rest_controller._get_hub_data(WISERHUBNETWORK)
-            log_response_to_file(network_data, "network", args.raw)
-        if args.type == "schedule" or args.type == "all":
-            schedule_data = wiser_rest_controller._get_hub_data(WISERHUBSCHEDULES)
-            log_response_to_file(schedule_data, "schedule", args.raw)
+        results = await asyncio.gather(
+            *[
+                wiser_rest_controller.get_hub_data(OUTPUT_ENDPOINTS[output_type])
+                for output_type in output_types
+            ]
+        )
+        for output_type, data in zip(output_types, results):
+            log_response_to_file(data, output_type, args.raw)
     except WiserHubAuthenticationError:
         print(
             "Unable to authenticate with your Wiser HeatHub.  Please check your secret key."
@@ -82,9 +193,195 @@ def output_json(args) -> None:
         print(
             f"Unknown error getting json data from your Wiser HeatHub.  Error is {ex}"
         )
+    finally:
+        await wiser_rest_controller.close()
+
+
+def _timing_stats(durations: list[float]) -> dict:
+    """Get count, mean and percentiles of durations in milliseconds"""
+    if not durations:
+        return {}
+    durations = sorted(duration * 1000 for duration in durations)
+
+    def percentile(p: int) -> float:
+        return round(durations[max(math.ceil(p / 100 * len(durations)) - 1, 0)], 3)
+
+    return {
+        "count": len(durations),
+        "min": round(durations[0], 3),
+        "mean": round(sum(durations) / len(durations), 3),
+        "p50": percentile(50),
+        "p90": percentile(90),
+        "p95": percentile(95),
+        "p99": percentile(99),
+        "max": round(durations[-1], 3),
+    }
+
+
+def _create_api(args):
+    """Get WiserAPI instance for a hub or mock hub without automations"""
+    # Imported here as wiserhub imports this module
+    from .wiserhub import WiserAPI
+
+    if not (args.mock or args.replay) and not (args.hostname and args.secret):
+        print(
+            "Provide a hostname and secret key, a mock hub data directory "
+            "or a recording to replay"
+        )
+        return None
+
+    api = WiserAPI(
+        args.hostname or "mock",
+        args.secret or "mock",
+        port=args.port,
+        enable_automations=False,
+    )
+    if args.mock:
+        api._wiser_rest_controller.transport = _WiserMockHub(
+            args.mock, args.latency / 1000
+        )
+    elif args.replay:
+        api.replay_recording(args.replay, args.speed)
+    return api
+
+
+def _time_schedule_codec(schedules: list, iterations: int) -> list[float]:
+    """
+    Round trip schedules through yaml and webservice formats and time each one
+    param schedules: list of _WiserSchedule objects
+    param iterations: number of times to round trip each schedule
+    return: list of round trip durations in seconds
+    """
+    durations = []
+    for _ in range(iterations):
+        for schedule in schedules:
+            start = time.perf_counter()
+            yaml_data = schedule._convert_from_wiser_schedule(schedule.schedule_data)
+            schedule._convert_to_wiser_schedule(yaml_load(yaml_dump(yaml_data)))
+            schedule._ws_schedule_data = None
+            schedule.ws_schedule_data
+            durations.append(time.perf_counter() - start)
+    return durations
 
 
-def show_version(args) -> None:
+async def bench(args) -> None:
+    if not (api := _create_api(args)):
+        return
+
+    commands = args.commands
+    if commands and not (args.mock or args.replay or args.commands_on_hub):
+        print(
+            "Commands are not timed against a hub as they change hub "
+            "configuration.  Add --commands-on-hub to time them"
+        )
+        commands = 0
+
+    exporter = WiserInMemorySpanExporter(max_spans=None)
+    api.tracer.add_exporter(exporter)
+
+    poll_durations = []
+    command_durations = []
+    codec_durations = []
+    try:
+        for _ in range(args.polls):
+            start = time.perf_counter()
+            await api.read_hub_data()
+            poll_durations.append(time.perf_counter() - start)
+
+        if commands and api.rooms and api.rooms.all:
+            room = api.rooms.all[0]
+            for _ in range(commands):
+                start = time.perf_counter()
+                await api._wiser_rest_controller._send_command(
+                    WISERROOM.format(room.id), {"Name": room.name}
+                )
+                command_durations.append(time.perf_counter() - start)
+
+        if args.schedule_codec and api.schedules:
+            codec_durations = _time_schedule_codec(
+                api.schedules.all, args.schedule_codec
+            )
+    except (WiserHubAuthenticationError, WiserHubConnectionError) as ex:
+        print(f"Unable to benchmark your Wiser HeatHub.  Error is {ex}")
+        return
+    finally:
+        await api.close()
+
+    results = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "version": __VERSION__,
+        "target": (
+            f"mock:{args.mock}"
+            if args.mock
+            else f"replay:{args.replay}" if args.replay else args.hostname
+        ),
+        "rooms": len(api.rooms.all) if api.rooms else 0,
+        "devices": len(api.devices.all) if api.devices else 0,
+        "requests_per_poll": round(api.metrics.stat("poll_requests").average, 2),
+        "poll_ms": _timing_stats(poll_durations),
+        "fetch_ms": _timing_stats(
+            [span.duration for span in exporter.get_by_name("fetch")]
+        ),
+        "build_ms": _timing_stats(
+            [span.duration for span in exporter.get_by_name("build")]
+        ),
+        "command_ms": _timing_stats(command_durations),
+        "schedule_codec_ms": _timing_stats(codec_durations),
+    }
+
+    if args.json:
+        print(json.dumps(results))
+        return
+
+    print(f"Target: {results['target']}")
+    print(f"Rooms: {results['rooms']}, Devices: {results['devices']}")
+    print(f"Requests per poll: {results['requests_per_poll']}")
+    for name in [
+        "poll_ms",
+        "fetch_ms",
+        "build_ms",
+        "command_ms",
+        "schedule_codec_ms",
+    ]:
+        if results[name]:
+            print(
+                f"{name.removesuffix('_ms').title()} (ms): "
+                + ", ".join(f"{key} {value}" for key, value in results[name].items())
+            )
+
+
+async def monitor(args) -> None:
+    if not (api := _create_api(args)):
+        return
+
+    if args.record:
+        await api.start_recording(args.record)
+    metrics = api.metrics
+    poller = api.start_polling(args.interval, args.min_interval, args.max_interval)
+    try:
+        while True:
+            result = await poller.wait_for_poll()
+            record = {
+                "time": datetime.fromtimestamp(result.started).isoformat(
+                    timespec="seconds"
+                ),
+                "poll_ms": round(result.duration * 1000, 3),
+                "next_interval": round(result.next_interval, 3),
+            }
+            if result.error:
+                record["error"] = str(result.error)
+            else:
+                record["requests"] = int(metrics.stat("poll_requests").last)
+                record["changes"] = result.changes
+            print(json.dumps(record, default=str), flush=True)
+
+            if args.polls and poller.polls >= args.polls:
+                break
+    finally:
+        await api.close()
+
+
+async def show_version(args) -> None:
     print(f"API version is {__VERSION__}")
 
 
@@ -92,6 +389,46 @@ def _add_default_arguments(parser: argparse.ArgumentParser):
     """Add the default arguments username, password, region to the parser."""
     parser.add_argument("hostname", help="HeatHub IP or DNS name")
     parser.add_argument("secret", help="Heathub secret key")
+    parser.add_argument(
+        "-p", "--port", dest="port", type=int, default=80, help="(optional) Hub port"
+    )
+
+
+def _add_hub_or_mock_arguments(parser: argparse.ArgumentParser):
+    """Add optional hub arguments and mock hub arguments to the parser."""
+    parser.add_argument(
+        "-m",
+        "--mock",
+        dest="mock",
+        help="(optional) Directory of json files written by wiser output to use as a mock hub instead of a hub",
+    )
+    parser.add_argument(
+        "-l",
+        "--latency",
+        dest="latency",
+        type=float,
+        default=0,
+        help="(optional) Milliseconds the mock hub waits before responding",
+    )
+    parser.add_argument(
+        "-R",
+        "--replay",
+        dest="replay",
+        help="(optional) Recording to replay instead of using a hub",
+    )
+    parser.add_argument(
+        "-s",
+        "--speed",
+        dest="speed",
+        type=float,
+        default=0,
+        help="(optional) Replay speed. 1 is recorded speed.  Default is 0 for as fast as possible",
+    )
+    parser.add_argument("hostname", nargs="?", help="HeatHub IP or DNS name")
+    parser.add_argument("secret", nargs="?", help="Heathub secret key")
+    parser.add_argument(
+        "-p", "--port", dest="port", type=int, default=80, help="(optional) Hub port"
+    )
 
 
 def log_response_to_file(
@@ -118,44 +455,14 @@ def log_response_to_file(
     print(f"{logfilename.title()} data written to {output_path}")
 
 
-def anonymise_data(json_data: dict) -> dict:
-    """Replace parts of the logfiles containing personal information."""
-
-    replacements = {
-        "Latitude": 30.4865,
-        "Longitude": 58.4892,
-        "SerialNumber": "ANON_SERIAL",
-        "MacAddress": "ANON_MAC",
-        "HostName": "WiserHeatXXXXXX",
-        "MdnsHostname": "WiserHeatXXXXXX",
-        "IPv4Address": "ANON_IP",
-        "IPv4HostAddress": "ANON_IP",
-        "IPv4DefaultGateway": "ANON_IP",
-        "IPv4PrimaryDNS": "ANON_IP",
-        "IPv4SecondaryDNS": "ANON_IP",
-        "SSID": "ANON_SSID",
-        "DetectedAccessPoints": [],
-    }
-
-    if isinstance(json_data, dict):
-        for key, value in json_data.items():
-            if isinstance(value, dict):
-                json_data[key] = anonymise_data(value)
-            elif isinstance(value, list):
-                key_data = []
-                for item in value:
-                    key_data.append(anonymise_data(item))
-                json_data[key] = key_data
-            elif key in replacements:
-                json_data[key] = replacements[key]
-    return json_data
-
-
 def main():
     """Main function."""
     parser = main_parser()
     args = parser.parse_args()
-    args.func(args)
+    try:
+        asyncio.run(args.func(args))
+    except KeyboardInterrupt:
+        pass
 
 
 if __name__ == "__main__":
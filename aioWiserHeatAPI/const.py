@@ -36,6 +36,46 @@ REST_RETRY_BACKOFF = [0.1, 0.5, 1, 3, 5]
 REST_BACKOFF_FACTOR = 1
 REST_RETRIES = 3
 REST_TIMEOUT = 20
+# Least response size in bytes to decode in an executor if parse offload is enabled
+OFFLOAD_PARSE_MIN_SIZE = 32768
+RESOLVER_TTL = 300
+RESOLVER_DISCOVERY_TIMEOUT = 60
+MONITOR_INTERVAL = 30
+POLL_INTERVAL = 30
+POLL_MIN_INTERVAL = 10
+POLL_MAX_INTERVAL = 120
+POLL_BACKOFF_FACTOR = 1.5
+# Fields that change on most polls and are not useful as activity
+MONITOR_IGNORED_FIELDS = [
+    "UnixTime",
+    "LocalDateAndTime",
+    "ReceptionOfController",
+    "ReceptionOfDevice",
+]
+AUTOMATION_COMMAND_CONCURRENCY = 4
+# Seconds to hold extra config changes before writing.  0 writes each change
+EXTRA_CONFIG_FLUSH_DELAY = 0
+ROOM_COMMAND_CONCURRENCY = 4
+SCHEDULE_ARCHIVE_VERSION = 1
+SCHEDULE_RESTORE_CONCURRENCY = 4
+SNAPSHOT_SAVE_INTERVAL = 300
+SNAPSHOT_VERSION = 1
+# Number of intervals of energy history held per metering device
+ENERGY_HISTORY_SIZE = 360
+# Hub endpoints read after domain, in order they are read on each poll
+HUB_ENDPOINTS = ["network", "schedule", "status", "opentherm"]
+# Hub endpoints each object collection is built from on first read.  Schedules
+# are added to devices, rooms and hot water when schedule data is read
+HUB_COLLECTION_ENDPOINTS = {
+    "system": ["domain", "network", "opentherm"],
+    "schedules": ["domain", "network", "schedule"],
+    "devices": ["domain"],
+    "rooms": ["domain"],
+    "hotwater": ["domain"],
+    "heating_channels": ["domain"],
+    "moments": ["domain"],
+    "status": ["status"],
+}
 
 # Text Values
 TEXT_AUTO = "Auto"
@@ -302,6 +302,21 @@ class _WiserDeviceCollection:
                 return room.get("id")
         return 0
 
+    def _attach_schedules(self, schedules: _WiserScheduleCollection):
+        """
+        Set schedules of devices built before schedule data was read
+        param schedules: schedule collection
+        """
+        self._schedules = schedules
+        for device_type, collection in self._device_collection.items():
+            if schedule_type := PRODUCT_TYPE_CONFIG[device_type].schedule_type:
+                for device in collection._items:
+                    device._attach_schedule(
+                        schedules.get_by_id(
+                            schedule_type, device._device_type_data.get("ScheduleId")
+                        )
+                    )
+
     @property
     def all(self) -> list[_WiserDevice]:
         """Return all devices"""
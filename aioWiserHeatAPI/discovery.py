@@ -1,7 +1,7 @@
 import asyncio
 from . import _LOGGER
 
-from typing import cast
+from typing import AsyncIterator, cast
 from zeroconf import ServiceStateChange, IPVersion
 from zeroconf.asyncio import AsyncServiceBrowser, AsyncZeroconf, AsyncServiceInfo
 
@@ -30,11 +30,17 @@ class _WiserDiscoveredHub(object):
 class WiserDiscovery(object):
     """
     Class to handle mDns discovery of a wiser hub on local network
-    Use discover_hub() to return list of mDns responses.
+    Use discover_hub() to return list of mDns responses or async_discover()
+    to get each hub as soon as it responds.
     """
 
-    def __init__(self):
+    def __init__(self, aiozc: AsyncZeroconf | None = None):
         self._discovered_hubs = []
+        self._hub_queue: asyncio.Queue | None = None
+        self._parse_tasks: set[asyncio.Task] = set()
+        self._shared_zeroconf = aiozc
+        self.aioZeroConf: AsyncZeroconf | None = None
+        self.aioBrowser: AsyncServiceBrowser | None = None
         self.mdns_timeout = MDNS_TIMEOUT
 
     @property
@@ -45,6 +51,11 @@ class WiserDiscovery(object):
     def mdns_timeout(self, mdns_timeout):
         self._mdns_timeout = mdns_timeout
 
+    @property
+    def discovered_hubs(self) -> list[_WiserDiscoveredHub]:
+        """Get hubs discovered so far"""
+        return self._discovered_hubs
+
     def async_on_service_state_change(
         self,
         zeroconf: AsyncZeroconf,
@@ -56,59 +67,68 @@ class WiserDiscovery(object):
         Look for Wiser Hub in discovered services and set IP and Name in
         global vars
         """
+        # Only resolve services that are Wiser hubs
+        if state_change == ServiceStateChange.Removed or "WiserHeat" not in name:
+            return
 
         loop = asyncio.get_running_loop()
-        loop.create_task(
+        task = loop.create_task(
             self.async_parse_state_change(zeroconf, service_type, name, state_change)
         )
+        self._parse_tasks.add(task)
+        task.add_done_callback(self._parse_tasks.discard)
+
+    def _add_hub(self, hub: _WiserDiscoveredHub) -> bool:
+        """
+        Add hub if not already discovered or if its address has changed
+        return: boolean - true = hub is new or has a new address
+        """
+        for idx, discovered in enumerate(self._discovered_hubs):
+            if discovered.hostname == hub.hostname:
+                if discovered.ip == hub.ip:
+                    return False
+                self._discovered_hubs[idx] = hub
+                return True
+            if discovered.ip == hub.ip:
+                return False
+        self._discovered_hubs.append(hub)
+        return True
 
     async def async_parse_state_change(
         self, zeroconf, service_type, name, state_change
     ):
+        if state_change == ServiceStateChange.Removed or "WiserHeat" not in name:
+            return
 
         info = AsyncServiceInfo(service_type, name)
+        if not await info.async_request(zeroconf, 3000):
+            return
+
+        addresses = [
+            "%s:%d" % (addr, cast(int, info.port)) for addr in info.parsed_addresses()
+        ]
+        if not addresses or not info.server:
+            return
+
+        hub = _WiserDiscoveredHub(
+            ip=addresses[0].replace(":80", ""),
+            hostname=info.server.replace(".local.", ".local").lower(),
+            name=info.server.replace(".local.", ""),
+        )
+        # Hubs can respond more than once and on service updates
+        if not self._add_hub(hub):
+            return
 
-        if state_change != ServiceStateChange.Removed:
-            info_success = await info.async_request(zeroconf, 3000)
-
-            if not info_success:
-                return
-
-            if "WiserHeat" in name:
-                if state_change == ServiceStateChange.Added:
-                    info_success = await info.async_request(zeroconf, 3000)
-
-                    if not info_success:
-                        return
-
-                if info:
-                    addresses = [
-                        "%s:%d" % (addr, cast(int, info.port))
-                        for addr in info.parsed_addresses()
-                    ]
-                    hub = _WiserDiscoveredHub(
-                        ip=addresses[0].replace(":80", ""),
-                        hostname=info.server.replace(".local.", ".local").lower(),
-                        name=info.server.replace(".local.", ""),
-                    )
-                    _LOGGER.debug(
-                        "Discovered Hub {} with IP Address {}".format(
-                            info.server.replace(".local.", ""),
-                            addresses[0].replace(":80", ""),
-                        )
-                    )
-                    self._discovered_hubs.append(hub)
-
-    async def discover_hub(self, min_search_time: int = 2, max_search_time: int = 10):
-        """
-        Call zeroconf service browser to find Wiser hubs on the local network.
-        param (optional) min_search_time: min seconds to wait for responses before returning
-        param (optional) max_search_time: max seconds to wait for responses before returning
-        return: list of discovered hubs
-        """
-        timeout = 0
+        _LOGGER.debug("Discovered Hub %s with IP Address %s", hub.name, hub.ip)
+        if self._hub_queue:
+            self._hub_queue.put_nowait(hub)
 
-        self.aioZeroConf = AsyncZeroconf(ip_version=IPVersion.V4Only)
+    async def _async_start(self):
+        self._discovered_hubs = []
+        self._hub_queue = asyncio.Queue()
+        self.aioZeroConf = self._shared_zeroconf or AsyncZeroconf(
+            ip_version=IPVersion.V4Only
+        )
         services = ["_http._tcp.local."]
         self.aioBrowser = AsyncServiceBrowser(
             self.aioZeroConf.zeroconf,
@@ -116,13 +136,77 @@ class WiserDiscovery(object):
             handlers=[self.async_on_service_state_change],
         )
 
-        if self.mdns_timeout > 0:
-            await asyncio.sleep(self.mdns_timeout)
+    async def async_discover(
+        self,
+        expected_hubs: int | None = None,
+        hostname: str | None = None,
+        timeout: float | None = None,
+    ) -> AsyncIterator[_WiserDiscoveredHub]:
+        """
+        Yield Wiser hubs on the local network as soon as they are found.  A hub
+        is yielded again if it is seen with a new address
+        param (optional) expected_hubs: stop once this many hubs are found
+        param (optional) hostname: stop once hub with this hostname or ip is found
+        param (optional) timeout: max seconds to search.  Defaults to mdns_timeout.
+        0 searches until cancelled
+        return: async iterator of discovered hubs
+        """
+        timeout = self.mdns_timeout if timeout is None else timeout
+        hostname = hostname.lower().replace(".local.", ".local") if hostname else None
+        loop = asyncio.get_running_loop()
+        end_time = loop.time() + timeout if timeout > 0 else None
+
+        await self._async_start()
+        try:
+            while True:
+                remaining = end_time - loop.time() if end_time else None
+                if remaining is not None and remaining <= 0:
+                    break
+                try:
+                    hub = await asyncio.wait_for(self._hub_queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                yield hub
+                if hostname and hostname in (hub.hostname, hub.name.lower(), hub.ip):
+                    break
+                if expected_hubs and len(self._discovered_hubs) >= expected_hubs:
+                    break
+        finally:
             await self.async_close()
+
+    async def discover_hub(
+        self,
+        min_search_time: int = 2,
+        max_search_time: int = 10,
+        expected_hubs: int | None = None,
+        hostname: str | None = None,
+    ):
+        """
+        Call zeroconf service browser to find Wiser hubs on the local network.
+        param (optional) min_search_time: min seconds to wait for responses before returning
+        param (optional) max_search_time: max seconds to wait for responses before returning
+        param (optional) expected_hubs: return early once this many hubs are found
+        param (optional) hostname: return early once hub with this hostname or ip is found
+        return: list of discovered hubs
+        """
+        if self.mdns_timeout <= 0:
+            # Keep browsing and return list which is updated as hubs respond
+            await self._async_start()
+            return self._discovered_hubs
+
+        async for _hub in self.async_discover(expected_hubs, hostname):
+            pass
         return self._discovered_hubs
 
     async def async_close(self) -> None:
-        assert self.aioZeroConf is not None
-        assert self.aioBrowser is not None
-        await self.aioBrowser.async_cancel()
-        await self.aioZeroConf.async_close()
+        """Stop browsing and close zeroconf if not shared"""
+        for task in list(self._parse_tasks):
+            task.cancel()
+        if self.aioBrowser is not None:
+            await self.aioBrowser.async_cancel()
+            self.aioBrowser = None
+        if self.aioZeroConf is not None:
+            if self.aioZeroConf is not self._shared_zeroconf:
+                await self.aioZeroConf.async_close()
+            self.aioZeroConf = None
+        self._hub_queue = None
@@ -1,5 +1,5 @@
 from .const import TEXT_UNKNOWN
-from .room import _WiserRoomCollection
+from .room import _WiserRoom, _WiserRoomCollection
 
 
 class _WiserHeatingChannel(object):
@@ -53,12 +53,23 @@ class _WiserHeatingChannelCollection(object):
         self._heating_channels = []
         self._heating_channel_data = heating_channel_data
         self._rooms = rooms
+        self._rooms_by_channel: dict[int, list[_WiserRoom]] = {}
         self._build()
 
     def _build(self):
         for heat_channel in self._heating_channel_data:
             self._heating_channels.append(_WiserHeatingChannel(heat_channel))
 
+        # Index rooms by heating channel once per hub data snapshot
+        rooms = self._rooms.all if self._rooms else []
+        rooms_by_id = {room.id: room for room in rooms}
+        for heating_channel in self._heating_channels:
+            self._rooms_by_channel[heating_channel.id] = [
+                rooms_by_id[room_id]
+                for room_id in heating_channel.room_ids or []
+                if room_id in rooms_by_id
+            ]
+
     @property
     def all(self) -> list[_WiserHeatingChannel]:
         return list(self._heating_channels)
@@ -78,6 +89,14 @@ class _WiserHeatingChannelCollection(object):
                 return heating_channel
         return None
 
+    def get_rooms_by_channel_id(self, channel_id: int) -> list[_WiserRoom]:
+        """
+        Gets the rooms attached to a Heating Channel
+        param channel_id: id of heating channel
+        return: list of _WiserRoom objects
+        """
+        return self._rooms_by_channel.get(channel_id, [])
+
     def get_by_room_id(self, room_id: int) -> _WiserHeatingChannel:
         """
         Gets a Heating Channel object from a Room ID
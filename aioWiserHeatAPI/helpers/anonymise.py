@@ -0,0 +1,36 @@
+"""
+Remove personal information from hub data before it is logged or recorded
+"""
+
+
+def anonymise_data(json_data: dict) -> dict:
+    """Replace parts of the logfiles containing personal information."""
+
+    replacements = {
+        "Latitude": 30.4865,
+        "Longitude": 58.4892,
+        "SerialNumber": "ANON_SERIAL",
+        "MacAddress": "ANON_MAC",
+        "HostName": "WiserHeatXXXXXX",
+        "MdnsHostname": "WiserHeatXXXXXX",
+        "IPv4Address": "ANON_IP",
+        "IPv4HostAddress": "ANON_IP",
+        "IPv4DefaultGateway": "ANON_IP",
+        "IPv4PrimaryDNS": "ANON_IP",
+        "IPv4SecondaryDNS": "ANON_IP",
+        "SSID": "ANON_SSID",
+        "DetectedAccessPoints": [],
+    }
+
+    if isinstance(json_data, dict):
+        for key, value in json_data.items():
+            if isinstance(value, dict):
+                json_data[key] = anonymise_data(value)
+            elif isinstance(value, list):
+                key_data = []
+                for item in value:
+                    key_data.append(anonymise_data(item))
+                json_data[key] = key_data
+            elif key in replacements:
+                json_data[key] = replacements[key]
+    return json_data
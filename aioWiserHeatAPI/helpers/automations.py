@@ -1,9 +1,12 @@
+import asyncio
 import logging
+from contextlib import nullcontext
 
-from ..const import WiserHeatingModeEnum
+from ..const import AUTOMATION_COMMAND_CONCURRENCY, WiserHeatingModeEnum
 from ..heating import _WiserHeatingChannelCollection
 from ..hot_water import _WiserHotwater
 from ..rest_controller import _WiserRestController
+from ..room import _WiserRoom
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -51,24 +54,32 @@ class _WiserHeatingChannelAutomations:
         heating_channels: _WiserHeatingChannelCollection,
     ):
         self._wiser_rest_controller = rest_controller
+        self._heating_channel_collection = heating_channels
         self._heating_channels = heating_channels.all
         self._rooms = heating_channels._rooms.all
+        self.updated_room_ids: set[int] = set()
 
     async def run_automations(self) -> bool:
         return await self.passive_mode_control()
 
-    async def passive_mode_control(self) -> bool:
-        hub_updated: bool = False
+    def _passive_mode_targets(self) -> list[tuple[_WiserRoom, float]]:
+        """
+        Get passive rooms that need a new target temperature
+        return: list of room and target temp pairs
+        """
         passive_mode_increment = (
             self._wiser_rest_controller._api_parameters.passive_mode_increment
         )
+        targets = []
         # iterate each heating channel
         for heating_channel in self._heating_channels:
+            channel_rooms = self._heating_channel_collection.get_rooms_by_channel_id(
+                heating_channel.id
+            )
             passive_rooms = [
                 room
-                for room in self._rooms
+                for room in channel_rooms
                 if room.is_passive_mode
-                and room.id in heating_channel.room_ids
                 and room.current_temperature  # added to prevent error if trv offline
             ]
 
@@ -79,15 +90,17 @@ class _WiserHeatingChannelAutomations:
 
             active_heating_rooms = [
                 room
-                for room in self._rooms
-                if room.id in heating_channel.room_ids
-                and (not room.is_passive_mode)
-                and room.percentage_demand > 0
+                for room in channel_rooms
+                if (not room.is_passive_mode) and room.percentage_demand > 0
             ]
 
-            _LOGGER.debug(
-                f"Heating Channel {heating_channel.id}, Passive Rooms {[room.name for room in passive_rooms]}, Active Rooms {[room.name for room in active_heating_rooms]}"
-            )
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "Heating Channel %s, Passive Rooms %s, Active Rooms %s",
+                    heating_channel.id,
+                    [room.name for room in passive_rooms],
+                    [room.name for room in active_heating_rooms],
+                )
 
             # If any active rooms are heating
             if active_heating_rooms:
@@ -114,10 +127,12 @@ class _WiserHeatingChannelAutomations:
 
                         if target_temp != room.current_target_temperature:
                             _LOGGER.debug(
-                                f"Setting {room.name} to {target_temp}C caused by active rooms on heating channel {heating_channel.id}"
+                                "Setting %s to %sC caused by active rooms on heating channel %s",
+                                room.name,
+                                target_temp,
+                                heating_channel.id,
                             )
-                            await room.set_target_temperature(target_temp)
-                            hub_updated = True
+                            targets.append((room, target_temp))
             else:
                 # Stop any passive rooms heating by setting to min temp
                 for room in passive_rooms:
@@ -125,9 +140,46 @@ class _WiserHeatingChannelAutomations:
                         room.current_target_temperature != room.passive_mode_lower_temp
                     ) and not room.is_boosted:
                         _LOGGER.debug(
-                            f"Setting {room.name} to {room.passive_mode_lower_temp}C caused by no active rooms on heating channel {heating_channel.id}"
+                            "Setting %s to %sC caused by no active rooms on heating channel %s",
+                            room.name,
+                            room.passive_mode_lower_temp,
+                            heating_channel.id,
                         )
-                        await room.set_target_temperature(room.passive_mode_lower_temp)
-                        hub_updated = True
+                        targets.append((room, room.passive_mode_lower_temp))
+        return targets
+
+    async def _set_target_temperatures(
+        self, targets: list[tuple[_WiserRoom, float]]
+    ) -> None:
+        """
+        Send target temperatures to rooms with bounded concurrency
+        Extra config changes are written once after all commands are sent
+        param targets: list of room and target temp pairs
+        """
+        semaphore = asyncio.Semaphore(AUTOMATION_COMMAND_CONCURRENCY)
+
+        async def set_target_temperature(room: _WiserRoom, target_temp: float):
+            async with semaphore:
+                await room.set_target_temperature(target_temp)
+                self.updated_room_ids.add(room.id)
+
+        extra_config = self._wiser_rest_controller._extra_config
+        async with (
+            extra_config.deferred_writes() if extra_config else nullcontext()
+        ):
+            results = await asyncio.gather(
+                *[
+                    set_target_temperature(room, target_temp)
+                    for room, target_temp in targets
+                ],
+                return_exceptions=True,
+            )
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
 
-        return hub_updated
+    async def passive_mode_control(self) -> bool:
+        targets = self._passive_mode_targets()
+        if targets:
+            await self._set_target_temperatures(targets)
+        return bool(self.updated_room_ids)
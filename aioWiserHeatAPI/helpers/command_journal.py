@@ -0,0 +1,145 @@
+"""
+Append only journal of hub commands that could not be sent due to a hub
+outage, so they can be replayed in order when the hub is reachable again
+"""
+
+import json
+import time
+from dataclasses import asdict, dataclass
+
+import aiofiles
+import aiofiles.os
+
+from ..exceptions import WiserHubConnectionError
+
+
+@dataclass
+class _WiserJournalCommand:
+    """Data structure for a journalled command"""
+
+    seq: int
+    method: str
+    url: str
+    data: dict | None
+    queued: float
+    updated: float
+
+
+class _WiserCommandJournal:
+    """
+    Class holding commands waiting to be replayed.  Each change is appended
+    to the journal file so pending commands survive a restart
+    """
+
+    def __init__(self, journal_file: str | None = None):
+        self._journal_file = journal_file
+        self._pending: dict[int, _WiserJournalCommand] = {}
+        self._seq = 0
+        self._loaded = False
+
+    @property
+    def pending(self) -> list[_WiserJournalCommand]:
+        """Get commands waiting to be replayed in send order"""
+        return list(self._pending.values())
+
+    @property
+    def count(self) -> int:
+        """Get number of commands waiting to be replayed"""
+        return len(self._pending)
+
+    async def _append(self, record: dict):
+        if self._journal_file:
+            async with aiofiles.open(self._journal_file, mode="a") as journal_file:
+                await journal_file.write(json.dumps(record) + "\n")
+
+    async def async_load(self):
+        """Rebuild pending commands from journal file"""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self._journal_file or not await aiofiles.os.path.exists(
+            self._journal_file
+        ):
+            return
+        async with aiofiles.open(self._journal_file, mode="r") as journal_file:
+            async for line in journal_file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Ignore line part written when process stopped
+                    continue
+                if record.get("op") == "add":
+                    # Updated commands keep their place in the queue
+                    command = _WiserJournalCommand(**record["command"])
+                    self._pending[command.seq] = command
+                    self._seq = max(self._seq, command.seq)
+                elif record.get("op") == "remove":
+                    self._pending.pop(record.get("seq"), None)
+
+    async def add(
+        self, method: str, url: str, data: dict | None
+    ) -> _WiserJournalCommand:
+        """
+        Add a command to the journal.  A PATCH setting the same fields as the
+        last pending PATCH to the endpoint replaces its values and keeps its
+        place in the queue
+        param method: http method
+        param url: endpoint url relative to domain
+        param data: json command data
+        return: _WiserJournalCommand
+        """
+        await self.async_load()
+        now = time.time()
+        last_to_url = next(
+            (
+                command
+                for command in reversed(self._pending.values())
+                if command.url == url
+            ),
+            None,
+        )
+        if (
+            last_to_url
+            and last_to_url.method == method == "patch"
+            and (last_to_url.data or {}).keys() == (data or {}).keys()
+        ):
+            last_to_url.data = data
+            last_to_url.updated = now
+            command = last_to_url
+        else:
+            self._seq += 1
+            command = _WiserJournalCommand(self._seq, method, url, data, now, now)
+            self._pending[command.seq] = command
+        await self._append({"op": "add", "command": asdict(command)})
+        return command
+
+    async def remove(self, seq: int):
+        """Remove a command once sent or discarded"""
+        if self._pending.pop(seq, None):
+            await self._append({"op": "remove", "seq": seq})
+        # Start a new journal file once everything has been replayed
+        if not self._pending and self._journal_file:
+            async with aiofiles.open(self._journal_file, mode="w"):
+                pass
+
+    async def clear(self):
+        """Discard all pending commands"""
+        for seq in list(self._pending):
+            await self.remove(seq)
+
+    async def replay(self, send) -> int:
+        """
+        Send pending commands in order, stopping at the first connection error
+        param send: coroutine function taking method, url and data
+        return: number of commands sent
+        """
+        await self.async_load()
+        sent = 0
+        for command in self.pending:
+            try:
+                await send(command.method, command.url, command.data)
+            except WiserHubConnectionError:
+                break
+            await self.remove(command.seq)
+            sent += 1
+        return sent
@@ -1,5 +1,4 @@
 import hashlib
-import inspect
 from typing import Union
 from uuid import UUID
 
@@ -13,6 +12,7 @@ from ..const import (
 )
 from ..helpers.misc import is_value_in_list
 from ..helpers.signal import _WiserSignalStrength
+from ..helpers.tracing import caller_name
 from ..rest_controller import _WiserRestController
 
 
@@ -52,11 +52,7 @@ class _WiserDevice(object):
             if result:
                 self._device_type_data = result
         if result:
-            _LOGGER.debug(
-                "Wiser device - {} command successful".format(
-                    inspect.stack()[1].function
-                )
-            )
+            _LOGGER.debug("Wiser device - %s command successful", caller_name())
             return True
         return False
 
@@ -215,9 +211,11 @@ class _WiserElectricalDevice(_WiserDevice):
         super().__init__(
             wiser_rest_controller, endpoint, data, device_type_data, schedule
         )
-        self._schedule = schedule
+        self._attach_schedule(schedule)
 
-        # Add device id to schedule
+    def _attach_schedule(self, schedule):
+        """Set device schedule and add device to schedule assignments"""
+        self._schedule = schedule
         if self._schedule:
             self._schedule._assignments.append(
                 {"id": self.device_type_id, "name": self.name}
@@ -272,6 +270,10 @@ class _WiserElectricalDevice(_WiserDevice):
         if isinstance(mode, WiserDeviceModeEnum):
             mode = mode.value
         if is_value_in_list(mode, self.available_modes):
+            if self._wiser_rest_controller._suppress_command(
+                mode.title() == self.mode, f"{self.name} set_mode {mode}"
+            ):
+                return True
             return await self._send_command({"Mode": mode.title()})
         else:
             raise ValueError(
@@ -0,0 +1,225 @@
+"""
+Accumulate energy of metering devices (smart plugs, heating actuators and
+power tags) from successive polls.  History of each meter is held in fixed
+size arrays so memory use does not grow with time or number of polls
+"""
+
+import time
+from array import array
+
+from ..const import ENERGY_HISTORY_SIZE
+
+
+class _WiserEnergyMeter:
+    """
+    Class to hold interval energy and power history of a metering device.
+    Energy is in the units of the device summation (Wh) and power in W
+    """
+
+    def __init__(self, device_id: int, size: int = ENERGY_HISTORY_SIZE):
+        self.device_id = device_id
+        self._size = size
+        self._times = array("d", [0.0]) * size
+        self._power = array("d", [0.0]) * size
+        self._delivered = array("d", [0.0]) * size
+        self._received = array("d", [0.0]) * size
+        self._index = 0
+        self._count = 0
+        self._last_time: float | None = None
+        self._last_power: float | None = None
+        self._last_delivered: float | None = None
+        self._last_received: float | None = None
+        self.total_delivered: float = 0.0
+        self.total_received: float = 0.0
+        self.resets: int = 0
+
+    @property
+    def count(self) -> int:
+        """Get number of intervals held"""
+        return self._count
+
+    def _ordered(self, values: array) -> list[float]:
+        if self._count < self._size:
+            return values[: self._count].tolist()
+        return (values[self._index :] + values[: self._index]).tolist()
+
+    @property
+    def times(self) -> list[float]:
+        """Get end times of intervals held, oldest first"""
+        return self._ordered(self._times)
+
+    @property
+    def power(self) -> list[float]:
+        """Get power at end of intervals held, oldest first"""
+        return self._ordered(self._power)
+
+    @property
+    def delivered(self) -> list[float]:
+        """Get energy delivered in intervals held, oldest first"""
+        return self._ordered(self._delivered)
+
+    @property
+    def received(self) -> list[float]:
+        """Get energy received in intervals held, oldest first"""
+        return self._ordered(self._received)
+
+    @property
+    def power_average(self) -> float:
+        """Get average power over intervals held"""
+        return sum(self._power[: self._count]) / self._count if self._count else 0.0
+
+    @property
+    def power_min(self) -> float:
+        """Get lowest power over intervals held"""
+        return min(self._power[: self._count]) if self._count else 0.0
+
+    @property
+    def power_max(self) -> float:
+        """Get highest power over intervals held"""
+        return max(self._power[: self._count]) if self._count else 0.0
+
+    def _interval_energy(
+        self, value: float | None, last_value: float | None
+    ) -> float | None:
+        """
+        Get energy between two summation readings.  A lower reading is
+        taken as a counter reset and the new reading as the energy since
+        """
+        if value is None or last_value is None:
+            return None
+        if value < last_value:
+            self.resets += 1
+            return value
+        return value - last_value
+
+    def update(
+        self,
+        timestamp: float,
+        power: float | None,
+        delivered: float | None = None,
+        received: float | None = None,
+    ) -> bool:
+        """
+        Add a reading.  Energy delivered is integrated from power if the
+        device has never reported a summation.  If a summation is missing
+        from a reading, its energy is counted by the next summation delta
+        param timestamp: unix time of reading
+        param power: instantaneous power
+        param delivered: summation of energy delivered
+        param received: summation of energy received
+        return: boolean - true = interval added
+        """
+        last_time = self._last_time
+        if last_time is not None and timestamp <= last_time:
+            # Hub data not updated since last reading
+            return False
+
+        delivered_energy = self._interval_energy(delivered, self._last_delivered)
+        received_energy = self._interval_energy(received, self._last_received)
+        if (
+            delivered_energy is None
+            and self._last_delivered is None
+            and delivered is None
+            and last_time is not None
+            and power is not None
+            and self._last_power is not None
+        ):
+            delivered_energy = (
+                (self._last_power + power) / 2 * (timestamp - last_time) / 3600
+            )
+
+        self._last_time = timestamp
+        self._last_power = power
+        if delivered is not None:
+            self._last_delivered = delivered
+        if received is not None:
+            self._last_received = received
+        if last_time is None:
+            return False
+
+        self._times[self._index] = timestamp
+        self._power[self._index] = power or 0.0
+        self._delivered[self._index] = delivered_energy or 0.0
+        self._received[self._index] = received_energy or 0.0
+        self._index = (self._index + 1) % self._size
+        self._count = min(self._count + 1, self._size)
+        self.total_delivered += delivered_energy or 0.0
+        self.total_received += received_energy or 0.0
+        return True
+
+    def energy_since(self, timestamp: float) -> float:
+        """
+        Get energy delivered in intervals ending after a time
+        param timestamp: unix time
+        return: energy delivered
+        """
+        return sum(
+            energy
+            for end_time, energy in zip(self._times[: self._count], self._delivered)
+            if end_time > timestamp
+        )
+
+    def as_dict(self) -> dict:
+        """Get meter totals and power stats as dict"""
+        return {
+            "device_id": self.device_id,
+            "intervals": self._count,
+            "total_delivered": round(self.total_delivered, 3),
+            "total_received": round(self.total_received, 3),
+            "power_average": round(self.power_average, 3),
+            "power_min": self.power_min,
+            "power_max": self.power_max,
+            "resets": self.resets,
+        }
+
+
+class _WiserEnergyAccumulator:
+    """Class to hold energy meters of all metering devices"""
+
+    def __init__(self, size: int = ENERGY_HISTORY_SIZE):
+        self._size = size
+        self._meters: dict[int, _WiserEnergyMeter] = {}
+
+    @property
+    def meters(self) -> list[_WiserEnergyMeter]:
+        """Get all energy meters"""
+        return list(self._meters.values())
+
+    def get_by_id(self, device_id: int) -> _WiserEnergyMeter | None:
+        """
+        Get energy meter of a device
+        param device_id: id of device
+        return: _WiserEnergyMeter object
+        """
+        return self._meters.get(device_id)
+
+    def update(self, devices: list, timestamp: float | None = None) -> int:
+        """
+        Add readings of metering devices.  Meters of devices no longer
+        present are removed
+        param devices: smart plug, heating actuator and power tag objects
+        param timestamp: unix time of readings.  Defaults to now
+        return: number of meters with an interval added
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        updated = 0
+        device_ids = set()
+        for device in devices:
+            try:
+                power = device.instantaneous_power
+                delivered = device.delivered_power
+                received = getattr(device, "received_power", None)
+            except AttributeError:
+                # Power tag without equipment data
+                continue
+            device_ids.add(device.id)
+            if not (meter := self._meters.get(device.id)):
+                meter = self._meters[device.id] = _WiserEnergyMeter(
+                    device.id, self._size
+                )
+            updated += meter.update(timestamp, power, delivered, received)
+
+        for device_id in self._meters.keys() - device_ids:
+            del self._meters[device_id]
+        return updated
@@ -1,23 +1,68 @@
+import asyncio
 import json
-from os.path import exists
+import logging
+from contextlib import asynccontextmanager, suppress
 
 import aiofiles
+import aiofiles.os
 
+from ..const import EXTRA_CONFIG_FLUSH_DELAY
 from ..exceptions import WiserExtraConfigError
 
+_LOGGER = logging.getLogger(__name__)
+
 
 class _WiserExtraConfig:
-    def __init__(self, config_file: str, hub_name: str):
+    """
+    In memory extra config store.  File is only re-read if changed on disk.
+    Updates are written when made, or in a single delayed flush if a flush
+    delay is set
+    """
+
+    def __init__(
+        self,
+        config_file: str,
+        hub_name: str,
+        flush_delay: float = EXTRA_CONFIG_FLUSH_DELAY,
+    ):
         self._config_file = config_file + "_" + hub_name
         self._config = {}
+        self._flush_delay = flush_delay
+        self._mtime: float | None = None
+        self._defer_writes = 0
+        self._pending_write = False
+        self._flush_task: asyncio.Task | None = None
+        # Writes share a temp file so only one can run at a time
+        self._write_lock = asyncio.Lock()
+
+    @property
+    def config_file(self) -> str:
+        """Get config file path"""
+        return self._config_file
+
+    @property
+    def has_pending_changes(self) -> bool:
+        """Get if there are updates not yet written to file"""
+        return self._pending_write
+
+    async def _get_mtime(self) -> float | None:
+        try:
+            return (await aiofiles.os.stat(self._config_file)).st_mtime
+        except FileNotFoundError:
+            return None
 
     async def async_load_config(self):
-        if exists(self._config_file):
+        mtime = await self._get_mtime()
+        if mtime is not None:
+            # Skip if unchanged since last load/write or would lose pending updates
+            if mtime == self._mtime or self._pending_write:
+                return
             async with aiofiles.open(self._config_file, mode="r") as config_file:
                 try:
                     contents = await config_file.read()
                     if contents:
                         self._config = json.loads(contents)
+                    self._mtime = mtime
                 except (
                     OSError,
                     EOFError,
@@ -26,7 +71,7 @@ class _WiserExtraConfig:
                     json.JSONDecodeError,
                 ) as ex:
                     raise WiserExtraConfigError("Error loading extra config file") from ex
-        else:
+        elif not self._pending_write:
             await self.async_update_config("Info", "Version", "1.0.0")
         return
 
@@ -42,27 +87,76 @@ class _WiserExtraConfig:
             else:
                 self._config[section][key] = value
 
-        await self.async_write_config()
+        await self._async_changed()
 
     async def async_remove_config(self, section: str, key: str):
         if key and self._config[section].get(key):
             del self._config[section][key]
 
-        await self.async_write_config()
+        await self._async_changed()
+
+    async def _async_changed(self):
+        """Mark config as changed and write now or after flush delay"""
+        self._pending_write = True
+        if self._defer_writes:
+            return
+        if not self._flush_delay:
+            await self.async_write_config()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self):
+        await asyncio.sleep(self._flush_delay)
+        self._flush_task = None
+        try:
+            await self.async_write_config()
+        except Exception as ex:
+            _LOGGER.error("%s. Will retry on next update", ex)
+
+    @asynccontextmanager
+    async def deferred_writes(self):
+        """Hold config file writes and write once when leaving context"""
+        self._defer_writes += 1
+        try:
+            yield self
+        finally:
+            self._defer_writes -= 1
+            if not self._defer_writes and self._pending_write:
+                await self._async_changed()
+
+    async def async_flush(self):
+        """Write any pending updates to file now"""
+        if flush_task := self._flush_task:
+            self._flush_task = None
+            flush_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await flush_task
+        if self._pending_write:
+            await self.async_write_config()
 
     async def async_write_config(self):
-        # Write to config file
-        async with aiofiles.open(self._config_file, mode="w") as config_file:
-            try:
-                await config_file.write(json.dumps(self._config, indent=2))
-            except (
-                OSError,
-                EOFError,
-                TypeError,
-                AttributeError,
-                json.JSONDecodeError,
-            ) as ex:
-                raise WiserExtraConfigError("Error writing to extra config file") from ex
+        # Write to temp file and rename so file is never left part written
+        temp_file = self._config_file + ".tmp"
+        try:
+            async with self._write_lock:
+                contents = json.dumps(self._config, indent=2)
+                self._pending_write = False
+                async with aiofiles.open(temp_file, mode="w") as config_file:
+                    await config_file.write(contents)
+                await aiofiles.os.replace(temp_file, self._config_file)
+                self._mtime = await self._get_mtime()
+        except asyncio.CancelledError:
+            self._pending_write = True
+            raise
+        except (
+            OSError,
+            EOFError,
+            TypeError,
+            AttributeError,
+            json.JSONDecodeError,
+        ) as ex:
+            self._pending_write = True
+            raise WiserExtraConfigError("Error writing to extra config file") from ex
 
     # @property
     def config(self, section: str = None, key: str = None):
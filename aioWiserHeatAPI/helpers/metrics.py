@@ -0,0 +1,84 @@
+"""
+Lightweight counters and stats to measure the cost of polling and
+commanding the hub
+"""
+
+import time
+from contextlib import contextmanager
+
+
+class _WiserStat:
+    """Class to hold stats of a recorded value such as a duration"""
+
+    def __init__(self):
+        self.count: int = 0
+        self.last: float = 0.0
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+    def record(self, value: float):
+        """Add a value"""
+        self.count += 1
+        self.last = value
+        self.total += value
+        self.max = max(self.max, value)
+
+    @property
+    def average(self) -> float:
+        """Get average value"""
+        return self.total / self.count if self.count else 0.0
+
+    def as_dict(self) -> dict:
+        """Get stats as dict"""
+        return {
+            "count": self.count,
+            "last": round(self.last, 6),
+            "average": round(self.average, 6),
+            "max": round(self.max, 6),
+            "total": round(self.total, 6),
+        }
+
+
+class _WiserMetrics:
+    """Class to hold named counters and stats"""
+
+    def __init__(self):
+        self._counters: dict[str, int] = {}
+        self._stats: dict[str, _WiserStat] = {}
+
+    def increment(self, name: str, value: int = 1):
+        """Increment a named counter"""
+        self._counters[name] = self._counters.get(name, 0) + value
+
+    def counter(self, name: str) -> int:
+        """Get value of a named counter"""
+        return self._counters.get(name, 0)
+
+    def record(self, name: str, value: float):
+        """Add a value to a named stat"""
+        self._stats.setdefault(name, _WiserStat()).record(value)
+
+    def stat(self, name: str) -> _WiserStat:
+        """Get a named stat"""
+        return self._stats.get(name, _WiserStat())
+
+    @contextmanager
+    def timed(self, name: str):
+        """Context manager to record duration of a block of code in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def reset(self):
+        """Clear all counters and stats"""
+        self._counters.clear()
+        self._stats.clear()
+
+    def as_dict(self) -> dict:
+        """Get all counters and stats as dict"""
+        return {
+            "counters": dict(self._counters),
+            "stats": {name: stat.as_dict() for name, stat in self._stats.items()},
+        }
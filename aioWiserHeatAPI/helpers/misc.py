@@ -1,3 +1,7 @@
+import asyncio
+import contextvars
+import functools
+
 import aiofiles.os as os
 
 
@@ -5,6 +9,14 @@ async def file_exists(file: str) -> bool:
     return await os.path.isfile(file)
 
 
+async def run_in_executor(func, *args):
+    # Copy context so tracing spans started in executor have the right parent
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(
+        None, functools.partial(context.run, func, *args)
+    )
+
+
 def is_value_in_list(value: str, item_list: list) -> bool:
     for item in item_list:
         if value.casefold() == item.casefold():
@@ -0,0 +1,75 @@
+"""
+Simple in process mock of a wiser hub serving json files written by
+wiser output.  Used to benchmark and test without a hub
+"""
+
+import asyncio
+import json
+import pathlib
+
+from ..exceptions import WiserHubRESTError
+
+MOCK_HUB_FILES = {
+    "domain": "domain.json",
+    "network": "network.json",
+    "schedules": "schedule.json",
+    "status": "status.json",
+    "opentherm": "opentherm.json",
+}
+
+
+class _WiserMockHub:
+    """
+    Transport for the rest controller that answers requests from hub data
+    files instead of a hub.  Commands are merged into the entity they are
+    sent to and the updated entity is returned, as the hub does
+    """
+
+    def __init__(self, data_dir: str, latency: float = 0.0):
+        self._data: dict[str, dict] = {}
+        self._latency = latency
+        path = pathlib.Path(data_dir).expanduser()
+        for endpoint, file_name in MOCK_HUB_FILES.items():
+            if (path / file_name).exists():
+                with open(path / file_name, encoding="UTF-8") as data_file:
+                    self._data[endpoint] = json.load(data_file)
+        if "domain" not in self._data:
+            raise FileNotFoundError(f"No hub data files found in {path}")
+
+    def _get_entity(self, endpoint: str, keys: list[str]) -> dict | list | None:
+        data = self._data.get(endpoint, {})
+        for key in keys:
+            if isinstance(data, dict):
+                data = data.get(key)
+            elif isinstance(data, list):
+                # Collections are lists of entities with an id
+                data = next((item for item in data if str(item.get("id")) == key), None)
+            else:
+                return None
+        return data
+
+    async def request(self, method: str, path: str, data: dict | None = None):
+        """
+        Answer a request to the hub rest api
+        param method: http method
+        param path: path of endpoint ie data/v2/domain/Room/1
+        param data: json command data
+        return: json response data
+        """
+        if self._latency:
+            await asyncio.sleep(self._latency)
+
+        parts = [part for part in path.split("/") if part][2:]
+        if not parts or parts[0].lower() not in MOCK_HUB_FILES:
+            raise WiserHubRESTError(f"Rest endpoint not found on mock hub for {path}")
+
+        entity = self._get_entity(parts[0].lower(), parts[1:])
+        if entity is None:
+            if method == "get":
+                raise WiserHubRESTError(f"Rest endpoint not found on mock hub for {path}")
+            return {}
+        if method == "patch" and data and isinstance(entity, dict):
+            entity.update(data)
+
+        # Return a copy as the hub would
+        return json.loads(json.dumps(entity))
@@ -0,0 +1,59 @@
+"""
+Track changes to hub entities between polls.  Only the last values of
+each entity are held so memory use does not grow over time
+"""
+
+from typing import Any
+
+from ..const import MONITOR_IGNORED_FIELDS
+
+
+class _WiserChangeMonitor:
+    """Class to get changed entity fields of domain data between polls"""
+
+    def __init__(self, ignored_fields: list[str] = MONITOR_IGNORED_FIELDS):
+        self._ignored_fields = set(ignored_fields)
+        self._snapshot: dict[tuple[str, Any], dict] | None = None
+
+    def _take_snapshot(self, domain_data: dict) -> dict[tuple[str, Any], dict]:
+        snapshot = {}
+        for entity, data in domain_data.items():
+            items = data if isinstance(data, list) else [data]
+            for item in items:
+                if isinstance(item, dict):
+                    snapshot[(entity, item.get("id", 0))] = {
+                        field: value
+                        for field, value in item.items()
+                        if field not in self._ignored_fields
+                    }
+        return snapshot
+
+    def update(self, domain_data: dict) -> list[dict]:
+        """
+        Get fields changed since last update.  All fields are returned on
+        first update
+        param domain_data: domain data from hub
+        return: list of dicts of entity, id and changed fields with new values.
+        Removed entities have a removed key set to true
+        """
+        snapshot = self._take_snapshot(domain_data)
+        previous = self._snapshot or {}
+        changes = []
+        for key, fields in snapshot.items():
+            last_fields = previous.get(key, {})
+            changed = {
+                field: value
+                for field, value in fields.items()
+                if field not in last_fields or last_fields[field] != value
+            }
+            changed.update(
+                {field: None for field in last_fields if field not in fields}
+            )
+            if changed:
+                changes.append({"entity": key[0], "id": key[1], "fields": changed})
+        changes.extend(
+            {"entity": key[0], "id": key[1], "removed": True}
+            for key in previous.keys() - snapshot.keys()
+        )
+        self._snapshot = snapshot
+        return changes
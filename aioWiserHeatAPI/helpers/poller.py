@@ -0,0 +1,221 @@
+"""
+Poll the hub in the background with an interval that adapts to activity.
+Polls are made more often after commands or changes and less often when
+nothing changes or the hub cannot be read
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from ..const import (
+    POLL_BACKOFF_FACTOR,
+    POLL_INTERVAL,
+    POLL_MAX_INTERVAL,
+    POLL_MIN_INTERVAL,
+)
+from ..exceptions import (
+    WiserHubAuthenticationError,
+    WiserHubConnectionError,
+    WiserHubRESTError,
+)
+from .monitor import _WiserChangeMonitor
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class _WiserPollResult:
+    """Data structure for the outcome of a background poll"""
+
+    started: float
+    duration: float
+    next_interval: float
+    changes: list[dict] = field(default_factory=list)
+    error: Exception | None = None
+
+
+class _WiserPoller:
+    """
+    Class to poll the hub in the background.  Only one poll runs at a time
+    and the interval is measured from the end of each poll.  Listeners are
+    called with a _WiserPollResult after each poll
+    """
+
+    def __init__(
+        self,
+        api,
+        interval: float = POLL_INTERVAL,
+        min_interval: float = POLL_MIN_INTERVAL,
+        max_interval: float = POLL_MAX_INTERVAL,
+        backoff_factor: float = POLL_BACKOFF_FACTOR,
+    ):
+        self._api = api
+        self._min_interval = min(min_interval, interval)
+        self._max_interval = max(max_interval, interval)
+        self._backoff_factor = backoff_factor
+        self._interval = interval
+        self._change_monitor = _WiserChangeMonitor()
+        self._listeners: list[Callable] = []
+        self._waiters: list[asyncio.Future] = []
+        self._task: asyncio.Task | None = None
+        self._wake = asyncio.Event()
+        self._stopping = False
+        self._commanded = False
+        self._next_poll = 0.0
+        self._started: float | None = None
+        self._busy = 0.0
+        self.polls: int = 0
+        self.last_result: _WiserPollResult | None = None
+
+    @property
+    def running(self) -> bool:
+        """Get if poller is running"""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def interval(self) -> float:
+        """Get seconds until poll after the last one"""
+        return self._interval
+
+    @property
+    def duty_cycle(self) -> float:
+        """Get fraction of time spent polling since poller was started"""
+        if self._started is None:
+            return 0.0
+        elapsed = time.monotonic() - self._started
+        return min(self._busy / elapsed, 1.0) if elapsed else 0.0
+
+    def add_listener(self, callback: Callable) -> Callable[[], None]:
+        """
+        Add function to call after each poll.  May be a coroutine function
+        param callback: function taking a _WiserPollResult
+        return: function to remove listener
+        """
+        self._listeners.append(callback)
+        return lambda: self._listeners.remove(callback)
+
+    async def wait_for_poll(self, timeout: float | None = None) -> _WiserPollResult:
+        """
+        Wait for the next poll to complete
+        param timeout: seconds to wait.  Raises TimeoutError if exceeded
+        return: result of poll
+        """
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            async with asyncio.timeout(timeout):
+                return await waiter
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def command_sent(self):
+        """Poll sooner as a command has been sent to the hub"""
+        self._commanded = True
+        self._interval = self._min_interval
+        if self.running:
+            self._next_poll = min(
+                self._next_poll, time.monotonic() + self._min_interval
+            )
+            self._wake.set()
+
+    def poll_now(self):
+        """Poll without waiting for the interval"""
+        self._next_poll = time.monotonic()
+        self._wake.set()
+
+    def start(self):
+        """Start polling.  First poll is made straight away"""
+        if self.running:
+            return
+        self._stopping = False
+        self._started = time.monotonic()
+        self._busy = 0.0
+        self._next_poll = self._started
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop polling.  Waits for any poll in progress to complete"""
+        if not self.running:
+            return
+        self._stopping = True
+        self._wake.set()
+        await self._task
+        self._task = None
+        for waiter in self._waiters:
+            waiter.cancel()
+
+    async def _run(self):
+        while not self._stopping:
+            await self._sleep_until_next_poll()
+            if not self._stopping:
+                await self._poll()
+
+    async def _sleep_until_next_poll(self):
+        while not self._stopping and (delay := self._next_poll - time.monotonic()) > 0:
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+            except TimeoutError:
+                pass
+
+    def _next_interval(self, result: _WiserPollResult, commanded: bool) -> float:
+        """
+        Get interval to next poll.  Tightens to min interval after commands
+        or changes, otherwise backs off towards max interval
+        """
+        if not result.error and (commanded or (result.changes and self.polls > 1)):
+            return self._min_interval
+        return min(self._interval * self._backoff_factor, self._max_interval)
+
+    async def _poll(self):
+        commanded, self._commanded = self._commanded, False
+        result = _WiserPollResult(time.time(), 0.0, self._interval)
+        start = time.monotonic()
+        try:
+            await self._api.read_hub_data()
+            result.changes = self._change_monitor.update(self._api._domain_data)
+        except (
+            WiserHubConnectionError,
+            WiserHubAuthenticationError,
+            WiserHubRESTError,
+        ) as ex:
+            _LOGGER.warning("Background poll of Wiser hub failed. %s", ex)
+            result.error = ex
+        except Exception as ex:
+            _LOGGER.exception("Unexpected error in background poll")
+            result.error = ex
+        result.duration = time.monotonic() - start
+        self._busy += result.duration
+        self.polls += 1
+
+        # Command sent during poll also tightens interval
+        self._interval = self._next_interval(result, commanded or self._commanded)
+        self._commanded = False
+        self._next_poll = time.monotonic() + self._interval
+        result.next_interval = self._interval
+
+        metrics = self._api.metrics
+        metrics.increment("poller_polls")
+        if result.error:
+            metrics.increment("poller_errors")
+        metrics.record("poller_interval", self._interval)
+        metrics.record("poller_duty_cycle", self.duty_cycle)
+
+        self.last_result = result
+        await self._notify(result)
+
+    async def _notify(self, result: _WiserPollResult):
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(result)
+        for callback in list(self._listeners):
+            try:
+                if inspect.isawaitable(awaitable := callback(result)):
+                    await awaitable
+            except Exception:
+                _LOGGER.exception("Error in poll listener %s", callback)
@@ -0,0 +1,170 @@
+"""
+Record hub requests and responses to a compressed json lines file and
+replay them as a transport for the rest controller.  Allows field issues
+to be reproduced and performance to be measured without a hub
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import time
+import zlib
+from collections import deque
+
+from ..exceptions import WiserHubConnectionError, WiserHubRESTError
+from .anonymise import anonymise_data
+from .misc import run_in_executor
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _WiserRecorder:
+    """
+    Class to append each hub request and its response or error to a gzip
+    json lines file.  Records are written and flushed in an executor by a
+    writer task so a recording is readable up to the last record written
+    if the process stops
+    """
+
+    def __init__(self, recording_file: str, anonymise: bool = True):
+        self._recording_file = recording_file
+        self._anonymise = anonymise
+        self._file: gzip.GzipFile | None = None
+        self._lines: list[bytes] = []
+        self._write_task: asyncio.Task | None = None
+        self.records: int = 0
+
+    @property
+    def recording_file(self) -> str:
+        """Get recording file path"""
+        return self._recording_file
+
+    def record(
+        self,
+        method: str,
+        path: str,
+        data: dict | None = None,
+        response=None,
+        error: str | None = None,
+        duration: float = 0.0,
+    ):
+        """
+        Add a request to the recording
+        param method: http method
+        param path: path of endpoint ie data/v2/domain/
+        param data: json command data
+        param response: json response data
+        param error: error if request failed
+        param duration: seconds request took
+        """
+        record = {
+            "time": time.time(),
+            "method": method,
+            "path": path,
+            "data": data,
+            "response": response,
+            "error": error,
+            "duration": round(duration, 6),
+        }
+        # Serialise before anonymising as it updates data in place
+        line = json.dumps(record, default=str)
+        if self._anonymise:
+            line = json.dumps(anonymise_data(json.loads(line)))
+
+        self._lines.append(line.encode("utf-8") + b"\n")
+        self.records += 1
+        if self._write_task is None or self._write_task.done():
+            self._write_task = asyncio.get_running_loop().create_task(
+                self._async_write()
+            )
+
+    async def _async_write(self):
+        while self._lines:
+            lines, self._lines = self._lines, []
+            try:
+                await run_in_executor(self._write, lines)
+            except OSError as ex:
+                _LOGGER.error("Error writing to recording file. %s", ex)
+
+    def _write(self, lines: list[bytes]):
+        if self._file is None:
+            self._file = gzip.open(self._recording_file, "ab")
+        self._file.write(b"".join(lines))
+        self._file.flush(zlib.Z_SYNC_FLUSH)
+
+    async def async_close(self):
+        """Write any pending records and close recording file"""
+        if self._write_task:
+            await self._write_task
+            self._write_task = None
+        if self._file:
+            await run_in_executor(self._file.close)
+            self._file = None
+
+
+def read_recording(recording_file: str) -> list[dict]:
+    """
+    Read records from a recording file.  Stops at any partly written record
+    param recording_file: path of recording
+    return: list of records in recorded order
+    """
+    records = []
+    try:
+        with gzip.open(recording_file, "rt", encoding="utf-8") as recording:
+            for line in recording:
+                records.append(json.loads(line))
+    except (EOFError, json.JSONDecodeError, zlib.error) as ex:
+        _LOGGER.debug(
+            "Recording %s ends with incomplete record. %s", recording_file, ex
+        )
+    return records
+
+
+class _WiserReplayHub:
+    """
+    Transport for the rest controller that answers requests with responses
+    from a recording.  Each endpoint returns its recorded responses in order.
+    Responses are delayed to match the recording unless speed is 0
+    """
+
+    def __init__(self, recording_file: str, speed: float = 1.0):
+        self._speed = speed
+        self._responses: dict[tuple[str, str], deque[dict]] = {}
+        records = read_recording(recording_file)
+        for record in records:
+            self._responses.setdefault(
+                (record["method"], record["path"]), deque()
+            ).append(record)
+        self._first_time = records[0]["time"] if records else 0.0
+        self._start_time: float | None = None
+
+    @property
+    def remaining(self) -> int:
+        """Get number of recorded responses not yet replayed"""
+        return sum(len(responses) for responses in self._responses.values())
+
+    async def request(self, method: str, path: str, data: dict | None = None):
+        """
+        Answer a request to the hub rest api from the recording
+        param method: http method
+        param path: path of endpoint ie data/v2/domain/Room/1
+        param data: json command data
+        return: json response data
+        """
+        responses = self._responses.get((method, path))
+        if not responses:
+            raise WiserHubRESTError(f"No recorded response for {method} {path}")
+        record = responses.popleft()
+
+        if self._speed:
+            # Records are timed when the response was received
+            offset = (record["time"] - self._first_time) / self._speed
+            now = time.monotonic()
+            if self._start_time is None:
+                self._start_time = now - offset
+            await asyncio.sleep(max(offset - (now - self._start_time), 0))
+
+        if record["error"]:
+            raise WiserHubConnectionError(record["error"])
+        return record["response"]
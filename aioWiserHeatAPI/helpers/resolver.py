@@ -0,0 +1,158 @@
+"""
+Resolve and cache the address of a wiser hub.  After a connection failure
+the address is re-resolved and a background mDns browser looks for the hub
+in case it has a new address
+"""
+
+import asyncio
+import ipaddress
+import logging
+import socket
+import time
+from contextlib import aclosing
+
+from zeroconf.asyncio import AsyncZeroconf
+
+from ..const import RESOLVER_DISCOVERY_TIMEOUT, RESOLVER_TTL
+from ..discovery import WiserDiscovery, _WiserDiscoveredHub
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _normalise_hostname(hostname: str) -> str:
+    """Get lower case hostname without trailing .local"""
+    return hostname.lower().rstrip(".").removesuffix(".local")
+
+
+def _is_ip_address(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
+
+
+class _WiserHubResolver:
+    """Class to hold resolved hub address"""
+
+    def __init__(
+        self,
+        host: str,
+        ttl: float = RESOLVER_TTL,
+        aiozc: AsyncZeroconf | None = None,
+        discovery_timeout: float = RESOLVER_DISCOVERY_TIMEOUT,
+    ):
+        self._host = host
+        self._ttl = ttl
+        self._discovery_timeout = discovery_timeout
+        self._aiozc = aiozc
+        self._is_ip = _is_ip_address(host)
+        self._address: str | None = host if self._is_ip else None
+        self._expires: float = 0.0
+        self._source: str | None = None
+        self._discovery_task: asyncio.Task | None = None
+        self.rebinds: int = 0
+        # mDns hostname reported by hub.  Used to find hub if configured by ip
+        self.hub_name: str | None = None
+
+    @property
+    def address(self) -> str | None:
+        """Get last resolved address"""
+        return self._address
+
+    @property
+    def discovery_running(self) -> bool:
+        """Get if background discovery is running"""
+        return bool(self._discovery_task and not self._discovery_task.done())
+
+    @property
+    def _hostnames(self) -> set[str]:
+        hostnames = set()
+        if not self._is_ip:
+            hostnames.add(_normalise_hostname(self._host))
+        if self.hub_name:
+            hostnames.add(_normalise_hostname(self.hub_name))
+        return hostnames
+
+    def _set_address(self, address: str, source: str):
+        if self._address and address != self._address:
+            self.rebinds += 1
+            _LOGGER.warning(
+                "Wiser hub %s address changed from %s to %s by %s",
+                self._host,
+                self._address,
+                address,
+                source,
+            )
+        self._address = address
+        self._source = source
+        self._expires = time.monotonic() + self._ttl
+
+    async def async_resolve(self) -> str:
+        """
+        Get hub address, resolving host if cached address has expired
+        return: ip address or host if unable to resolve
+        """
+        if self._address and (self._is_ip or time.monotonic() < self._expires):
+            return self._address
+
+        try:
+            addresses = await asyncio.get_running_loop().getaddrinfo(
+                self._host, None, family=socket.AF_INET, type=socket.SOCK_STREAM
+            )
+        except OSError as ex:
+            # Keep using last known address, which discovery may update
+            _LOGGER.debug("Unable to resolve %s - %s", self._host, ex)
+            return self._address or self._host
+
+        self._set_address(addresses[0][4][0], "name resolution")
+        return self._address
+
+    def rebind(self):
+        """
+        Force address to be re-resolved and start background discovery to find
+        hub if its address has changed.  Discovery stops once the hub is found
+        or after the discovery timeout.  Called after connection failures
+        """
+        # Address found by discovery is newer than name resolution may give
+        if self._source != "discovery":
+            self._expires = 0.0
+        if self.discovery_running or not self._hostnames:
+            return
+        self._discovery_task = asyncio.get_running_loop().create_task(
+            self._async_discover()
+        )
+
+    def _is_hub(self, hub: _WiserDiscoveredHub) -> bool:
+        return bool(
+            self._hostnames
+            & {_normalise_hostname(hub.hostname), _normalise_hostname(hub.name)}
+        )
+
+    async def _async_discover(self):
+        discovery = WiserDiscovery(self._aiozc)
+        _LOGGER.debug("Starting background discovery for %s", self._hostnames)
+        try:
+            async with aclosing(
+                discovery.async_discover(timeout=self._discovery_timeout)
+            ) as hubs:
+                async for hub in hubs:
+                    if self._is_hub(hub):
+                        self._set_address(hub.ip.split(":")[0], "discovery")
+                        break
+                else:
+                    _LOGGER.debug("Background discovery did not find hub")
+        except Exception as ex:
+            _LOGGER.debug("Background discovery stopped - %s", ex)
+        finally:
+            await discovery.async_close()
+
+    async def async_close(self):
+        """Stop background discovery"""
+        if self._discovery_task:
+            self._discovery_task.cancel()
+            try:
+                await self._discovery_task
+            except asyncio.CancelledError:
+                pass
+            self._discovery_task = None
@@ -0,0 +1,177 @@
+"""
+Event driven automation rules.  Rules declare the hub data fields they
+depend on and are only evaluated when one of those fields changes
+between polls
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any
+
+from .automations import _WiserHeatingChannelAutomations
+
+if TYPE_CHECKING:
+    from ..wiserhub import WiserAPI
+
+_LOGGER = logging.getLogger(__name__)
+
+# Pseudo entity for per room extra config (passive mode settings etc)
+EXTRA_CONFIG_ROOMS = "ExtraConfigRooms"
+
+
+class WiserAutomationRule(ABC):
+    """
+    Base class for automation rules.
+    depends_on maps a domain data entity (Room, HeatingChannel, HotWater,
+    System or ExtraConfigRooms) to the list of fields the rule reads
+    """
+
+    name: str = "rule"
+    depends_on: dict[str, list[str]] = {}
+
+    @abstractmethod
+    async def evaluate(self, api: "WiserAPI", changes: dict[str, set]) -> set[int]:
+        """
+        Evaluate rule and send any commands to the hub
+        param api: WiserAPI instance
+        param changes: dict of entity and set of ids with changed dependencies
+        return: set of ids of rooms changed by the rule
+        """
+
+
+class _WiserPassiveModeRule(WiserAutomationRule):
+    """Rule to heat passive mode rooms only when other rooms are heating"""
+
+    name = "passive_mode"
+    depends_on = {
+        "Room": [
+            "CalculatedTemperature",
+            "PercentageDemand",
+            "Mode",
+            "DisplayedSetPoint",
+            "ScheduledSetPoint",
+            "SetpointOrigin",
+            "SetPointOrigin",
+        ],
+        "HeatingChannel": ["RoomIds"],
+        EXTRA_CONFIG_ROOMS: ["passive_mode", "min", "max"],
+    }
+
+    async def evaluate(self, api: "WiserAPI", changes: dict[str, set]) -> set[int]:
+        if not api.heating_channels:
+            return set()
+        automations = _WiserHeatingChannelAutomations(
+            api._wiser_rest_controller, api.heating_channels
+        )
+        await automations.run_automations()
+        return automations.updated_room_ids
+
+
+class _WiserAutomationEngine:
+    """Class to run automation rules whose dependencies changed since last poll"""
+
+    def __init__(self):
+        self._rules: dict[str, WiserAutomationRule] = {}
+        self._snapshot: dict[str, dict[Any, dict]] | None = None
+        self._pending: set[str] = set()
+
+    @property
+    def rules(self) -> list[WiserAutomationRule]:
+        """Get registered rules"""
+        return list(self._rules.values())
+
+    def register(self, rule: WiserAutomationRule):
+        """Add a rule, replacing any existing rule with the same name"""
+        self._rules[rule.name] = rule
+        # Always evaluate a new rule on next run
+        self._pending.add(rule.name)
+
+    def unregister(self, name: str):
+        """Remove a rule by name"""
+        self._rules.pop(name, None)
+        self._pending.discard(name)
+
+    def _watched_fields(self) -> dict[str, set[str]]:
+        watched = {}
+        for rule in self._rules.values():
+            for entity, fields in rule.depends_on.items():
+                watched.setdefault(entity, set()).update(fields)
+        return watched
+
+    def _take_snapshot(self, api: "WiserAPI") -> dict[str, dict[Any, dict]]:
+        """Get watched field values of all entities keyed by entity and id"""
+        snapshot = {}
+        extra_config = api._wiser_rest_controller._extra_config
+        for entity, fields in self._watched_fields().items():
+            if entity == EXTRA_CONFIG_ROOMS:
+                # Extra config is keyed by room id as a string
+                items = (
+                    (int(room_id) if room_id.isdigit() else room_id, config)
+                    for room_id, config in (
+                        (extra_config.config("Rooms") or {}).items()
+                        if extra_config
+                        else []
+                    )
+                )
+            else:
+                data = api._domain_data.get(entity, [])
+                if isinstance(data, dict):
+                    data = [data]
+                items = ((item.get("id", 0), item) for item in data)
+            snapshot[entity] = {
+                item_id: {field: item.get(field) for field in fields}
+                for item_id, item in items
+            }
+        return snapshot
+
+    def _changes(
+        self, rule: WiserAutomationRule, snapshot: dict[str, dict[Any, dict]]
+    ) -> dict[str, set]:
+        """Get ids of entities where fields the rule depends on have changed"""
+        changes = {}
+        for entity, fields in rule.depends_on.items():
+            current = snapshot.get(entity, {})
+            previous = (self._snapshot or {}).get(entity, {})
+            changed = {
+                item_id
+                for item_id in current.keys() | previous.keys()
+                if item_id not in current
+                or item_id not in previous
+                or any(
+                    current[item_id].get(field) != previous[item_id].get(field)
+                    for field in fields
+                )
+            }
+            if changed:
+                changes[entity] = changed
+        return changes
+
+    def update_snapshot(self, api: "WiserAPI"):
+        """Record current values so changes made by rules do not retrigger them"""
+        self._snapshot = self._take_snapshot(api)
+
+    async def run(self, api: "WiserAPI") -> set[int]:
+        """
+        Evaluate rules with changed dependencies
+        param api: WiserAPI instance
+        return: set of ids of rooms changed by rules
+        """
+        snapshot = self._take_snapshot(api)
+        tracer = api._wiser_rest_controller.tracer
+        updated_room_ids = set()
+        for rule in list(self._rules.values()):
+            changes = self._changes(rule, snapshot)
+            if not changes and rule.name not in self._pending:
+                continue
+            self._pending.discard(rule.name)
+            try:
+                with tracer.span("automation", rule=rule.name) as span:
+                    rule_room_ids = set(await rule.evaluate(api, changes) or [])
+                    span.set_attribute("updated_rooms", sorted(rule_room_ids))
+                updated_room_ids |= rule_room_ids
+            except Exception as ex:
+                # Retry on next run whether or not anything changes
+                self._pending.add(rule.name)
+                _LOGGER.error("Error running automation rule %s - %s", rule.name, ex)
+        self._snapshot = snapshot
+        return updated_room_ids
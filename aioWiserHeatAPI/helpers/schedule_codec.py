@@ -0,0 +1,66 @@
+"""
+Fast conversion helpers for schedule time values and yaml serialisation
+"""
+
+from typing import Any
+
+import yaml
+
+from ..const import SPECIAL_DAYS, SPECIAL_TIMES, WEEKDAYS, WEEKENDS
+
+# Use libyaml C implementations when available
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+SCHEDULE_DAYS = frozenset(WEEKDAYS + WEEKENDS + SPECIAL_DAYS)
+SPECIAL_TIME_NAMES = {hub_time: name for name, hub_time in SPECIAL_TIMES.items()}
+
+
+def format_hub_time(hub_time: int | str) -> str:
+    """Convert hub HHMM time format to HH:MM string"""
+    hub_time = int(hub_time)
+    return f"{hub_time // 100:02d}:{hub_time % 100:02d}"
+
+
+def parse_clock_time(clock_time: str) -> int | None:
+    """
+    Convert HH:MM time string to hub HHMM time format
+    param clock_time: time string
+    return: int or None if not a valid time
+    """
+    if not isinstance(clock_time, str):
+        return None
+    hours, sep, minutes = clock_time.partition(":")
+    if (
+        sep
+        and 0 < len(hours) <= 2
+        and 0 < len(minutes) <= 2
+        and hours.isdigit()
+        and minutes.isdigit()
+    ):
+        hours, minutes = int(hours), int(minutes)
+        if hours < 24 and minutes < 60:
+            return hours * 100 + minutes
+    return None
+
+
+def is_valid_clock_time(clock_time: str) -> bool:
+    """Return if value is a valid HH:MM time string"""
+    return parse_clock_time(clock_time) is not None
+
+
+def yaml_load(data: str) -> Any:
+    """Load yaml string"""
+    return yaml.load(data, YAML_LOADER)
+
+
+def yaml_dump(data: Any) -> str:
+    """Dump data to yaml string in schedule file format"""
+    return yaml.dump(
+        data,
+        default_flow_style=False,
+        allow_unicode=True,
+        sort_keys=False,
+        Dumper=YAML_DUMPER,
+    ).replace(": null\n", ":\n")
+
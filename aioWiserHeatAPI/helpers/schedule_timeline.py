@@ -0,0 +1,171 @@
+"""
+Compiled weekly timeline of a schedule to allow local lookups of
+scheduled settings without a hub round trip
+"""
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import datetime, time as dt_time, timedelta
+from typing import Any
+
+from ..const import WEEKDAYS, WEEKENDS
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MINUTES_PER_DAY = 1440
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+WEEK_DAYS = WEEKDAYS + WEEKENDS
+
+
+def hub_time_to_minutes(hub_time: int | str) -> int:
+    """Convert hub HHMM time format to minutes past midnight"""
+    hub_time = int(hub_time)
+    return (hub_time // 100) * 60 + hub_time % 100
+
+
+def clock_time_to_minutes(clock_time: str) -> int | None:
+    """Convert HH:MM time string to minutes past midnight"""
+    try:
+        hours, minutes = clock_time.split(":")
+        return int(hours) * 60 + int(minutes)
+    except (AttributeError, ValueError):
+        return None
+
+
+def week_minute(when: datetime) -> int:
+    """Get minutes since Monday 00:00 for a datetime"""
+    return when.weekday() * MINUTES_PER_DAY + when.hour * 60 + when.minute
+
+
+@dataclass(frozen=True)
+class _WiserScheduleTimelineEntry:
+    """Data structure for a timeline entry"""
+
+    day: str
+    time: dt_time
+    setting: Any
+    datetime: "datetime | None" = None
+
+
+class _WiserScheduleTimeline:
+    """
+    Sorted per week minute offset arrays for a schedule.
+    Lookups are done by bisection so are O(log n)
+    """
+
+    def __init__(self, entries: list[tuple[int, Any]]):
+        entries = sorted(entries, key=lambda entry: entry[0])
+        self._offsets = [offset for offset, _ in entries]
+        self._settings = [setting for _, setting in entries]
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    @property
+    def offsets(self) -> list[int]:
+        """Get sorted week minute offsets of setting changes"""
+        return self._offsets
+
+    @property
+    def settings(self) -> list[Any]:
+        """Get settings matching offsets"""
+        return self._settings
+
+    def _entry(
+        self, index: int, when: datetime | None = None
+    ) -> _WiserScheduleTimelineEntry:
+        offset = self._offsets[index]
+        day, minute = divmod(offset, MINUTES_PER_DAY)
+        return _WiserScheduleTimelineEntry(
+            day=WEEK_DAYS[day],
+            time=dt_time(minute // 60, minute % 60),
+            setting=self._settings[index],
+            datetime=when,
+        )
+
+    def setting_at_offset(self, offset: int) -> Any:
+        """
+        Get setting in force at a week minute offset
+        param offset: minutes since Monday 00:00
+        return: setting or None if schedule is empty
+        """
+        if not self._offsets:
+            return None
+        # Index -1 wraps to last entry of previous week
+        index = bisect_right(self._offsets, offset % MINUTES_PER_WEEK) - 1
+        return self._settings[index]
+
+    def settings_at_offsets(self, offsets) -> list[Any]:
+        """
+        Get settings in force at many week minute offsets in one batch.
+        Uses a vectorised search if numpy is available
+        param offsets: sequence or numpy array of minutes since Monday 00:00
+        return: list or numpy array of settings
+        """
+        if not self._offsets:
+            return [None] * len(offsets)
+        if np is not None:
+            indexes = (
+                np.searchsorted(
+                    self._offsets, np.asarray(offsets) % MINUTES_PER_WEEK, "right"
+                )
+                - 1
+            )
+            return np.asarray(self._settings)[indexes]
+        return [self.setting_at_offset(offset) for offset in offsets]
+
+    def setting_at(self, when: datetime) -> Any:
+        """
+        Get setting in force at a given time
+        param when: datetime to lookup
+        return: setting or None if schedule is empty
+        """
+        return self.setting_at_offset(week_minute(when))
+
+    def next_change(self, when: datetime) -> _WiserScheduleTimelineEntry | None:
+        """
+        Get the next schedule entry after a given time
+        param when: datetime to lookup from
+        return: _WiserScheduleTimelineEntry or None if schedule is empty
+        """
+        if not self._offsets:
+            return None
+        offset = week_minute(when)
+        index = bisect_right(self._offsets, offset)
+        week_start = (when - timedelta(minutes=offset)).replace(
+            second=0, microsecond=0
+        )
+        if index == len(self._offsets):
+            index = 0
+            week_start += timedelta(weeks=1)
+        return self._entry(
+            index, week_start + timedelta(minutes=self._offsets[index])
+        )
+
+    def day_timeline(self, day: str) -> list[_WiserScheduleTimelineEntry]:
+        """
+        Get the full timeline for a day including the setting carried in at midnight
+        param day: day of week name
+        return: list of _WiserScheduleTimelineEntry
+        """
+        if not self._offsets:
+            return []
+        day_index = WEEK_DAYS.index(day.title())
+        start = day_index * MINUTES_PER_DAY
+        lo = bisect_left(self._offsets, start)
+        hi = bisect_left(self._offsets, start + MINUTES_PER_DAY)
+
+        timeline = [self._entry(index) for index in range(lo, hi)]
+        if lo == hi or self._offsets[lo] != start:
+            timeline.insert(
+                0,
+                _WiserScheduleTimelineEntry(
+                    day=WEEK_DAYS[day_index],
+                    time=dt_time(0, 0),
+                    setting=self._settings[lo - 1],
+                ),
+            )
+        return timeline
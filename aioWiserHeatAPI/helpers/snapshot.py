@@ -0,0 +1,110 @@
+"""
+Persist the last good hub data so objects can be built from it at startup
+before the hub has been read
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import time
+from datetime import datetime
+
+import aiofiles
+import aiofiles.os
+
+from ..const import SNAPSHOT_SAVE_INTERVAL, SNAPSHOT_VERSION
+from .misc import file_exists, run_in_executor
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _WiserSnapshot:
+    """
+    Class to save and load hub endpoint data as compressed json.  Saves are
+    limited to one per save interval
+    """
+
+    def __init__(
+        self, snapshot_file: str, save_interval: float = SNAPSHOT_SAVE_INTERVAL
+    ):
+        self._snapshot_file = snapshot_file
+        self._save_interval = save_interval
+        self._last_save: float | None = None
+        # Saves share a temp file so only one can run at a time
+        self._save_lock = asyncio.Lock()
+        self.created: datetime | None = None
+
+    @property
+    def snapshot_file(self) -> str:
+        """Get snapshot file path"""
+        return self._snapshot_file
+
+    async def async_load(self) -> dict[str, dict] | None:
+        """
+        Load hub data from snapshot file
+        return: dict of endpoint data or None if no valid snapshot
+        """
+        if not await file_exists(self._snapshot_file):
+            return None
+        try:
+            async with aiofiles.open(self._snapshot_file, "rb") as file:
+                snapshot = json.loads(gzip.decompress(await file.read()))
+        except (OSError, EOFError, json.JSONDecodeError) as ex:
+            _LOGGER.warning("Unable to load snapshot %s. %s", self._snapshot_file, ex)
+            return None
+        if snapshot.get("Version") != SNAPSHOT_VERSION or not snapshot.get(
+            "Data", {}
+        ).get("domain"):
+            _LOGGER.debug("Ignoring snapshot with unsupported version or no data")
+            return None
+        self.created = datetime.fromisoformat(snapshot["Created"])
+        return snapshot["Data"]
+
+    async def async_save(self, data: dict[str, dict], force: bool = False) -> bool:
+        """
+        Save hub data to snapshot file if save interval has passed
+        param data: dict of endpoint data
+        param force: save even if save interval has not passed
+        return: boolean - true = saved
+        """
+        if (
+            not force
+            and self._last_save is not None
+            and time.monotonic() - self._last_save < self._save_interval
+        ):
+            return False
+
+        created = datetime.now()
+        snapshot = {
+            "Version": SNAPSHOT_VERSION,
+            "Created": created.isoformat(timespec="seconds"),
+            "Data": data,
+        }
+        # Write to temp file and rename so file is never left part written
+        temp_file = self._snapshot_file + ".tmp"
+        async with self._save_lock:
+            try:
+                contents = await run_in_executor(self._encode, snapshot)
+            except (RuntimeError, TypeError, ValueError) as ex:
+                # Data changed by a command while being encoded
+                _LOGGER.debug("Unable to encode snapshot, will retry. %s", ex)
+                return False
+            try:
+                async with aiofiles.open(temp_file, "wb") as file:
+                    await file.write(contents)
+                await aiofiles.os.replace(temp_file, self._snapshot_file)
+            except OSError as ex:
+                _LOGGER.warning(
+                    "Unable to save snapshot %s. %s", self._snapshot_file, ex
+                )
+                return False
+        self._last_save = time.monotonic()
+        self.created = created
+        return True
+
+    @staticmethod
+    def _encode(snapshot: dict) -> bytes:
+        return gzip.compress(
+            json.dumps(snapshot, separators=(",", ":")).encode("utf-8")
+        )
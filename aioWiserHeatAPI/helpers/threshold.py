@@ -1,9 +1,8 @@
-import inspect
-
 from .. import _LOGGER
 from ..const import TEXT_UNKNOWN
 from ..rest_controller import _WiserRestController
 from .temp import _WiserTemperatureFunctions as tf
+from .tracing import caller_name
 
 
 class _WiserThresholdSensor:
@@ -31,11 +30,7 @@ class _WiserThresholdSensor:
         if result:
             self._device_type_data = result
         if result:
-            _LOGGER.debug(
-                "Wiser light - {} command successful".format(
-                    inspect.stack()[1].function
-                )
-            )
+            _LOGGER.debug("Wiser light - %s command successful", caller_name())
             return True
         return False
 
@@ -0,0 +1,285 @@
+"""
+Lightweight structured tracing of polls, hub requests and commands.
+Tracing is disabled until an exporter is added and then costs only a
+method call per span
+"""
+
+import asyncio
+import json
+import logging
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from contextvars import ContextVar
+from typing import Any
+
+from .misc import run_in_executor
+
+_LOGGER = logging.getLogger(__name__)
+
+_current_span: ContextVar["_WiserSpan | None"] = ContextVar(
+    "wiser_current_span", default=None
+)
+
+
+def caller_name(depth: int = 2) -> str:
+    """
+    Get name of calling function without walking the whole stack
+    param depth: frames up from this function, 2 is caller of the caller
+    return: function name
+    """
+    try:
+        return sys._getframe(depth).f_code.co_name
+    except ValueError:
+        return "unknown"
+
+
+class _WiserSpan:
+    """Class representing a timed operation with attributes"""
+
+    __slots__ = (
+        "_tracer",
+        "_token",
+        "_perf_start",
+        "duration",
+        "name",
+        "attributes",
+        "parent",
+        "start",
+        "end",
+        "error",
+    )
+
+    def __init__(self, tracer: "_WiserTracer", name: str, attributes: dict):
+        self._tracer = tracer
+        self._token = None
+        self._perf_start: float = 0.0
+        self.name = name
+        self.attributes = attributes
+        self.parent: str | None = None
+        self.start: float = 0.0
+        self.end: float = 0.0
+        self.duration: float = 0.0
+        self.error: str | None = None
+
+    def __enter__(self) -> "_WiserSpan":
+        parent = _current_span.get()
+        self.parent = parent.name if parent else None
+        self._token = _current_span.set(self)
+        self.start = time.time()
+        self._perf_start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.duration = time.perf_counter() - self._perf_start
+        self.end = self.start + self.duration
+        if exc_type:
+            self.error = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self._token)
+        self._tracer._export(self)
+        return False
+
+    def set_attribute(self, key: str, value: Any):
+        """Add an attribute to the span"""
+        self.attributes[key] = value
+
+    def as_dict(self) -> dict:
+        """Get span as dict"""
+        return {
+            "name": self.name,
+            "parent": self.parent,
+            "start": self.start,
+            "duration": round(self.duration, 6),
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class _WiserNoopSpan:
+    """Span used when tracing is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_WiserNoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+    def set_attribute(self, key: str, value: Any):
+        """Ignore attribute"""
+
+
+_NOOP_SPAN = _WiserNoopSpan()
+
+
+class WiserSpanExporter(ABC):
+    """Base class for span exporters"""
+
+    @abstractmethod
+    def export(self, span: _WiserSpan):
+        """Export a finished span"""
+
+    async def async_flush(self):
+        """Wait for any buffered spans to be exported"""
+
+    def close(self):
+        """Release any resources held by exporter"""
+
+
+class WiserLogSpanExporter(WiserSpanExporter):
+    """Export spans to a logger"""
+
+    def __init__(self, logger: logging.Logger = _LOGGER, level: int = logging.DEBUG):
+        self._logger = logger
+        self._level = level
+
+    def export(self, span: _WiserSpan):
+        self._logger.log(
+            self._level,
+            "Span %s took %.3fs %s%s",
+            span.name,
+            span.duration,
+            span.attributes,
+            f" error: {span.error}" if span.error else "",
+        )
+
+
+class WiserJsonLinesSpanExporter(WiserSpanExporter):
+    """
+    Export spans as one json object per line to a file.  Spans are buffered
+    and written in an executor so the event loop does not wait on the file
+    """
+
+    def __init__(self, file_name: str):
+        self._file_name = file_name
+        self._file = None
+        self._lines: list[str] = []
+        # Spans can be exported from executor threads
+        self._lines_lock = threading.Lock()
+        self._file_lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._write_task: asyncio.Task | None = None
+
+    def export(self, span: _WiserSpan):
+        line = json.dumps(span.as_dict(), default=str) + "\n"
+        with self._lines_lock:
+            self._lines.append(line)
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            if self._loop is None or self._loop.is_closed():
+                self._write()
+            else:
+                self._loop.call_soon_threadsafe(self._start_write)
+            return
+        self._start_write()
+
+    def _start_write(self):
+        if self._write_task is None or self._write_task.done():
+            self._write_task = self._loop.create_task(self._async_write())
+
+    async def _async_write(self):
+        while self._lines:
+            try:
+                await run_in_executor(self._write)
+            except OSError as ex:
+                _LOGGER.debug("Error writing spans to %s - %s", self._file_name, ex)
+                return
+
+    def _write(self):
+        with self._file_lock:
+            with self._lines_lock:
+                lines, self._lines = self._lines, []
+            if not lines:
+                return
+            if self._file is None:
+                self._file = open(self._file_name, "a", encoding="utf-8")
+            self._file.writelines(lines)
+            self._file.flush()
+
+    async def async_flush(self):
+        if self._write_task:
+            await self._write_task
+
+    def close(self):
+        self._write()
+        with self._file_lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+
+class WiserInMemorySpanExporter(WiserSpanExporter):
+    """Keep the most recent spans in memory"""
+
+    def __init__(self, max_spans: int | None = 1000):
+        self._spans: deque[_WiserSpan] = deque(maxlen=max_spans)
+
+    @property
+    def spans(self) -> list[_WiserSpan]:
+        """Get exported spans oldest first"""
+        return list(self._spans)
+
+    def get_by_name(self, name: str) -> list[_WiserSpan]:
+        """Get exported spans with name"""
+        return [span for span in self._spans if span.name == name]
+
+    def export(self, span: _WiserSpan):
+        self._spans.append(span)
+
+    def clear(self):
+        """Remove all spans"""
+        self._spans.clear()
+
+
+class _WiserTracer:
+    """Class to create spans and pass them to exporters when finished"""
+
+    def __init__(self):
+        self._exporters: list[WiserSpanExporter] = []
+
+    @property
+    def enabled(self) -> bool:
+        """Get if any exporters are registered"""
+        return bool(self._exporters)
+
+    @property
+    def exporters(self) -> list[WiserSpanExporter]:
+        """Get registered exporters"""
+        return list(self._exporters)
+
+    def add_exporter(self, exporter: WiserSpanExporter):
+        """Add exporter and enable tracing"""
+        self._exporters.append(exporter)
+
+    def remove_exporter(self, exporter: WiserSpanExporter):
+        """Remove and close exporter.  Tracing is disabled if none remain"""
+        if exporter in self._exporters:
+            self._exporters.remove(exporter)
+            exporter.close()
+
+    async def async_flush(self):
+        """Wait for buffered spans of all exporters to be exported"""
+        for exporter in list(self._exporters):
+            await exporter.async_flush()
+
+    def span(self, name: str, **attributes) -> _WiserSpan | _WiserNoopSpan:
+        """
+        Create a span to use as a context manager
+        param name: name of operation ie poll, fetch, parse, build, automation, command
+        param attributes: attributes to add to span
+        return: span
+        """
+        if not self._exporters:
+            return _NOOP_SPAN
+        return _WiserSpan(self, name, attributes)
+
+    def _export(self, span: _WiserSpan):
+        for exporter in self._exporters:
+            try:
+                exporter.export(span)
+            except Exception as ex:
+                _LOGGER.debug("Error exporting span %s - %s", span.name, ex)
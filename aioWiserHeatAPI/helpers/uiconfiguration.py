@@ -1,9 +1,8 @@
-import inspect
-
 from aioWiserHeatAPI import _LOGGER
 
 from ..const import TEXT_UNKNOWN
 from ..rest_controller import _WiserRestController
+from .tracing import caller_name
 
 
 class _WiserUIConfigSensor:
@@ -31,11 +30,7 @@ class _WiserUIConfigSensor:
         if result:
             self._device_type_data = result
         if result:
-            _LOGGER.debug(
-                "Wiser light - {} command successful".format(
-                    inspect.stack()[1].function
-                )
-            )
+            _LOGGER.debug("Wiser light - %s command successful", caller_name())
             return True
         return False
 
@@ -1,5 +1,4 @@
 import asyncio
-import inspect
 from datetime import datetime
 
 from aioWiserHeatAPI.exceptions import WiserExtraConfigError
@@ -20,6 +19,7 @@ from .const import (
 )
 from .helpers.misc import is_value_in_list
 from .helpers.temp import _WiserTemperatureFunctions as tf
+from .helpers.tracing import caller_name
 from .rest_controller import _WiserRestController
 from .schedule import _WiserSchedule
 
@@ -54,7 +54,11 @@ class _WiserHotwater(object):
 
         self._current_temperature: float = 0.0
 
-        # Add device id to schedule
+        self._attach_schedule(schedule)
+
+    def _attach_schedule(self, schedule: _WiserSchedule | None):
+        """Set hot water schedule and add hot water to schedule assignments"""
+        self._schedule = schedule
         if self._schedule:
             self.schedule._assignments.append({"id": self.id, "name": self.name})
 
@@ -67,12 +71,11 @@ class _WiserHotwater(object):
         result = await self._wiser_rest_controller._send_command(
             WISERHOTWATER.format(self.id), cmd
         )
+        if isinstance(result, dict) and result.get("id") == self.id:
+            # Apply updated hot water returned by hub so changes show without a poll
+            self._data.update(result)
         if result:
-            _LOGGER.debug(
-                "Wiser hot water - {} command successful".format(
-                    inspect.stack()[1].function
-                )
-            )
+            _LOGGER.debug("Wiser hot water - %s command successful", caller_name())
             return True
         return False
 
@@ -1,4 +1,3 @@
-import inspect
 from typing import Union
 
 from . import _LOGGER
@@ -13,6 +12,7 @@ from .const import (
 )
 from .helpers.device import _WiserElectricalDevice
 from .helpers.misc import is_value_in_list
+from .helpers.tracing import caller_name
 
 
 class _WiserOutputRange(object):
@@ -58,11 +58,7 @@ class _WiserLight(_WiserElectricalDevice):
             if result:
                 self._device_type_data = result
         if result:
-            _LOGGER.debug(
-                "Wiser light - {} command successful".format(
-                    inspect.stack()[1].function
-                )
-            )
+            _LOGGER.debug("Wiser light - %s command successful", caller_name())
             return True
         return False
 
@@ -179,6 +175,10 @@ class _WiserLight(_WiserElectricalDevice):
         Turn on the light at current brightness level
         return: boolean
         """
+        if self._wiser_rest_controller._suppress_command(
+            self.is_on, f"{self.name} turn_on"
+        ):
+            return True
         return await self._send_command({"RequestOverride": {"State": TEXT_ON}})
 
     async def turn_off(self) -> bool:
@@ -186,6 +186,10 @@ class _WiserLight(_WiserElectricalDevice):
         Turn off the light
         return: boolean
         """
+        if self._wiser_rest_controller._suppress_command(
+            not self.is_on, f"{self.name} turn_off"
+        ):
+            return True
         return await self._send_command({"RequestOverride": {"State": TEXT_OFF}})
 
 
@@ -1,7 +1,6 @@
-import inspect
-
 from . import _LOGGER
 from .const import TEXT_UNKNOWN, WISERSYSTEM
+from .helpers.tracing import caller_name
 from .rest_controller import _WiserRestController
 
 
@@ -22,11 +21,7 @@ class _WiserMoment(object):
             WISERSYSTEM, cmd
         )
         if result:
-            _LOGGER.debug(
-                "Wiser hub - {} command successful".format(
-                    inspect.stack()[1].function
-                )
-            )
+            _LOGGER.debug("Wiser hub - %s command successful", caller_name())
             return True
         return False
 
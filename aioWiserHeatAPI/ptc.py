@@ -2,13 +2,13 @@
 Handles power tag energy devices
 """
 
-import inspect
 
 from aioWiserHeatAPI import _LOGGER
 
 from .const import TEXT_OFF, TEXT_ON, TEXT_UNABLE, TEXT_UNKNOWN, WISERDEVICE
 from .helpers.device import _WiserElectricalDevice
 from .helpers.equipment import _WiserEquipment
+from .helpers.tracing import caller_name
 
 
 class _WiserPowerTagControl(_WiserElectricalDevice):
@@ -33,11 +33,7 @@ class _WiserPowerTagControl(_WiserElectricalDevice):
             if result:
                 self._device_type_data = result
         if result:
-            _LOGGER.debug(
-                "Wiser light - {} command successful".format(
-                    inspect.stack()[1].function
-                )
-            )
+            _LOGGER.debug("Wiser light - %s command successful", caller_name())
             return True
         return False
 
@@ -120,6 +116,10 @@ class _WiserPowerTagControl(_WiserElectricalDevice):
         Turn on the smart plug
         return: boolean
         """
+        if self._wiser_rest_controller._suppress_command(
+            self.is_on, f"{self.name} turn_on"
+        ):
+            return True
         result = await self._send_command({"RequestOutput": TEXT_ON})
         if result:
             self._output_state = TEXT_ON
@@ -130,6 +130,10 @@ class _WiserPowerTagControl(_WiserElectricalDevice):
         Turn off the smart plug
         return: boolean
         """
+        if self._wiser_rest_controller._suppress_command(
+            not self.is_on, f"{self.name} turn_off"
+        ):
+            return True
         result = await self._send_command({"RequestOutput": TEXT_OFF})
         if result:
             self._output_state = TEXT_OFF
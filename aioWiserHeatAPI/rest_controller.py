@@ -11,10 +11,13 @@ from typing import Optional
 import aiohttp
 import aiohttp.client_exceptions
 import aiohttp.http_exceptions
+from zeroconf.asyncio import AsyncZeroconf
 
 from . import _LOGGER
 from .const import (
     DEFAULT_BOOST_DELTA,
+    EXTRA_CONFIG_FLUSH_DELAY,
+    OFFLOAD_PARSE_MIN_SIZE,
     REST_RETRY_BACKOFF,
     REST_TIMEOUT,
     WISERHUBDOMAIN,
@@ -28,7 +31,12 @@ from .exceptions import (
     WiserHubResponseError,
     WiserHubRESTError,
 )
+from .helpers.command_journal import _WiserCommandJournal, _WiserJournalCommand
 from .helpers.extra_config import _WiserExtraConfig
+from .helpers.metrics import _WiserMetrics
+from .helpers.misc import run_in_executor
+from .helpers.resolver import _WiserHubResolver
+from .helpers.tracing import _WiserTracer
 
 
 @dataclass
@@ -39,6 +47,17 @@ class WiserAPIParams:
     stored_manual_target_temperature_alt_source: str = "current"
     boost_temp_delta: int = DEFAULT_BOOST_DELTA
     hw_climate_mode: bool = False
+    suppress_unchanged_commands: bool = False
+    # Decode large responses and build objects in an executor
+    offload_parsing: bool = False
+    offload_build: bool = False
+    # Seconds to hold extra config changes before writing.  0 writes each change
+    extra_config_flush_delay: float = EXTRA_CONFIG_FLUSH_DELAY
+
+
+def _url_path(url: str) -> str:
+    """Get path of endpoint from url ie data/v2/domain/"""
+    return url.split("/", 1)[1]
 
 
 # Connection info class
@@ -50,6 +69,8 @@ class _WiserConnectionInfo(object):
         self.units = WiserUnitsEnum.metric
         self.extra_config_file: str | None = None
         self.enable_automations: bool = False
+        self.command_journal_file: str | None = None
+        self.aiozc: AsyncZeroconf | None = None
 
 
 # Enums
@@ -81,11 +102,55 @@ class _WiserRestController(object):
 
         self._last_exception = None
         self.use_https: bool = False
+        # Alternative to http requests to a hub ie _WiserMockHub
+        self.transport = None
+        # Recorder of requests and responses ie _WiserRecorder
+        self.recorder = None
+        # Background poller to tell about commands ie _WiserPoller
+        self.poller = None
+        self.metrics = _WiserMetrics()
+        self.tracer = _WiserTracer()
+
+        # Cached hub address which is rebound after connection failures
+        self._resolver: _WiserHubResolver | None = None
+        if wiser_connection_info and wiser_connection_info.host:
+            self._resolver = _WiserHubResolver(
+                wiser_connection_info.host, aiozc=wiser_connection_info.aiozc
+            )
+
+        # Journal to hold commands during hub outages
+        self._command_journal: _WiserCommandJournal | None = None
+        if wiser_connection_info and wiser_connection_info.command_journal_file:
+            self._command_journal = _WiserCommandJournal(
+                wiser_connection_info.command_journal_file
+            )
+        self._replay_lock = asyncio.Lock()
 
     def remove_control_characters(self, data: str):
         """Remove control charactwers from string."""
         return re.sub(r"[\x00-\x1f]", "", data)
 
+    def _decode_json(self, content: bytes):
+        return json.loads(
+            self.remove_control_characters(content.decode("utf-8", "ignore"))
+        )
+
+    async def _parse_response(self, content: bytes):
+        """
+        Decode json response.  Large responses are decoded in an executor if
+        parse offload is enabled so the event loop is not blocked
+        param content: response body
+        return: decoded json
+        """
+        if (
+            self._api_parameters.offload_parsing
+            and len(content) >= OFFLOAD_PARSE_MIN_SIZE
+        ):
+            self.metrics.increment("offloaded_parses")
+            return await run_in_executor(self._decode_json, content)
+        with self.metrics.timed("loop_blocked"):
+            return self._decode_json(content)
+
     async def _do_hub_action(
         self,
         action: WiserRestActionEnum,
@@ -96,9 +161,13 @@ class _WiserRestController(object):
         """Function to retry on response errors due to inconsistant isues reading from the hub."""
         http_version = aiohttp.HttpVersion11
         self._last_exception = None
+        last_exception = None
 
-        for i in range(5):
+        self.metrics.increment("requests")
+        # Retrying a mock or replayed hub will not change the response
+        for i in range(1 if self.transport else 5):
             if i > 0:
+                self.metrics.increment("request_retries")
                 await asyncio.sleep(REST_RETRY_BACKOFF[i])
             try:
                 start_time = datetime.now()
@@ -118,33 +187,43 @@ class _WiserRestController(object):
                     raise_for_endpoint_error,
                     http_version,
                 )
-                _LOGGER.debug(
-                    "Request successful and took %ss",
-                    (datetime.now() - start_time).total_seconds(),
-                )
+                duration = (datetime.now() - start_time).total_seconds()
+                self.metrics.record("request", duration)
+                _LOGGER.debug("Request successful and took %ss", duration)
+                if self.recorder:
+                    self.recorder.record(
+                        action.value, _url_path(url), data, response, None, duration
+                    )
 
             except WiserHubRESTError as ex:
                 # if json error try http1.1
                 _LOGGER.debug("%s. Retrying in %.1fs", ex, REST_RETRY_BACKOFF[i])
-                self._last_exception = ex
+                self._last_exception = last_exception = ex
                 http_version = aiohttp.HttpVersion11
             except WiserHubResponseError as ex:
                 # If response error try http1.0
                 _LOGGER.debug("%s. Retrying in %.1fs", ex, REST_RETRY_BACKOFF[i])
-                self._last_exception = ex
+                self._last_exception = last_exception = ex
                 http_version = aiohttp.HttpVersion10
             except WiserHubConnectionError as ex:
-                # Connection timed out or failed.  Try it again
+                # Connection timed out or failed.  Check hub address and try again
                 _LOGGER.debug("%s. Retrying in %.1fs", ex, REST_RETRY_BACKOFF[i])
-                self._last_exception = ex
+                self._last_exception = last_exception = ex
+                if self._resolver:
+                    self._resolver.rebind()
             except Exception as ex:
                 # Unknown error
                 _LOGGER.debug("%s. Retrying in %.1fs", ex, REST_RETRY_BACKOFF[i])
-                self._last_exception = ex
+                self._last_exception = last_exception = ex
             else:
                 return response
 
-        raise WiserHubConnectionError(self._last_exception)
+        self.metrics.increment("request_failures")
+        if self.recorder:
+            self.recorder.record(
+                action.value, _url_path(url), data, None, str(last_exception)
+            )
+        raise WiserHubConnectionError(last_exception) from last_exception
 
     async def _execute_request(
         self,
@@ -161,15 +240,29 @@ class _WiserRestController(object):
         return: boolean
         """
 
+        if self.transport:
+            try:
+                return await self.transport.request(action.value, _url_path(url), data)
+            except WiserHubRESTError:
+                if raise_for_endpoint_error:
+                    raise
+                return {}
+
+        host = (
+            await self._resolver.async_resolve()
+            if self._resolver
+            else self._wiser_connection_info.host
+        )
+
         # Set correct http(s) prefix
         if self.use_https:
             port = self._wiser_connection_info.port
-            url = "https://" + url.format(self._wiser_connection_info.host, 443 if port == 80 else port)    
+            url = "https://" + url.format(host, 443 if port == 80 else port)
         else:
             url = "http://" + url.format(
-            self._wiser_connection_info.host,
-            self._wiser_connection_info.port,
-        )
+                host,
+                self._wiser_connection_info.port,
+            )
 
         kwargs = {}
         kwargs["headers"] = {
@@ -203,11 +296,9 @@ class _WiserRestController(object):
                     else:
                         content = await response.read()
                         if len(content) > 0:
-                            response = content.decode("utf-8", "ignore")
                             try:
-                                return json.loads(
-                                    self.remove_control_characters(response),
-                                )
+                                with self.tracer.span("parse", size=len(content)):
+                                    return await self._parse_response(content)
                             except json.decoder.JSONDecodeError as ex:
                                 raise WiserHubRESTError(
                                     f"""JSON decoding error from {url}. Error is - {ex}.
@@ -281,20 +372,31 @@ class _WiserRestController(object):
 
     async def get_hub_data(self, url: str, raise_for_endpoint_error: bool = True):
         """Get data from hub"""
-        return await self._do_hub_action(
-            WiserRestActionEnum.GET,
-            url,
-            raise_for_endpoint_error=raise_for_endpoint_error,
-        )
+        with self.tracer.span("fetch", url=url):
+            return await self._do_hub_action(
+                WiserRestActionEnum.GET,
+                url,
+                raise_for_endpoint_error=raise_for_endpoint_error,
+            )
 
     async def get_extra_config_data(self):
         # Load extra config file
 
         if self._extra_config_file:
             try:
-                self._extra_config = _WiserExtraConfig(
-                    self._extra_config_file, self._hub_name.lower()
-                )
+                # Keep loaded config unless file or hub has changed
+                config_file = self._extra_config_file + "_" + self._hub_name.lower()
+                if (
+                    not self._extra_config
+                    or self._extra_config.config_file != config_file
+                ):
+                    if self._extra_config:
+                        await self._extra_config.async_flush()
+                    self._extra_config = _WiserExtraConfig(
+                        self._extra_config_file,
+                        self._hub_name.lower(),
+                        self._api_parameters.extra_config_flush_delay,
+                    )
                 await self._extra_config.async_load_config()
             except WiserExtraConfigError:
                 _LOGGER.error(
@@ -303,6 +405,32 @@ class _WiserRestController(object):
                 )
                 self._extra_config = None
 
+    def _suppress_command(self, unchanged: bool, command: str) -> bool:
+        """
+        Get if a command should not be sent as it would not change anything
+        param unchanged: if entity is already in the requested state
+        param command: description of command for logging
+        return: boolean
+        """
+        if unchanged and self._api_parameters.suppress_unchanged_commands:
+            self.metrics.increment("suppressed_commands")
+            _LOGGER.debug("Not sending unchanged command - %s", command)
+            return True
+        return False
+
+    async def close(self):
+        """
+        Write pending extra config updates and trace spans, stop discovery
+        and close recording
+        """
+        await self.tracer.async_flush()
+        if self._extra_config:
+            await self._extra_config.async_flush()
+        if self._resolver:
+            await self._resolver.async_close()
+        if self.recorder:
+            await self.recorder.async_close()
+
     async def _send_command(
         self,
         url: str,
@@ -313,14 +441,97 @@ class _WiserRestController(object):
         Send control command to hub and raise errors if fails
         param url: url of hub rest api endpoint
         param patchData: json object containing command and values to set
-        return: boolean
+        return: hub response, or the _WiserJournalCommand if the command was
+        queued for replay as the hub is unavailable
         """
-        url = WISERHUBDOMAIN + url
+        self.metrics.increment("commands")
+        if self.poller:
+            self.poller.command_sent()
         _LOGGER.debug(
-            "Sending command to url: %s with parameters %s", url, command_data
+            "Sending command to url: %s with parameters %s",
+            WISERHUBDOMAIN + url,
+            command_data,
         )
 
-        return await self._do_hub_action(method, url, command_data)
+        with self.tracer.span("command", url=url, method=method.value) as span:
+            if not self._command_journal:
+                return await self._do_hub_action(
+                    method, WISERHUBDOMAIN + url, command_data
+                )
+
+            # Send pending commands first to keep send order.  Queue behind
+            # them if hub is still unavailable
+            await self._command_journal.async_load()
+            if self._command_journal.count:
+                await self.replay_commands()
+                if self._command_journal.count:
+                    span.set_attribute("queued", True)
+                    return await self._queue_command(method, url, command_data)
+            try:
+                return await self._do_hub_action(
+                    method, WISERHUBDOMAIN + url, command_data
+                )
+            except WiserHubConnectionError as ex:
+                if not self._is_hub_outage(ex):
+                    raise
+                span.set_attribute("queued", True)
+                return await self._queue_command(method, url, command_data)
+
+    @staticmethod
+    def _is_hub_outage(ex: WiserHubConnectionError) -> bool:
+        """Get if a request failed because hub could not be reached"""
+        return not isinstance(
+            ex.__cause__, (WiserHubAuthenticationError, WiserHubRESTError)
+        )
+
+    async def _queue_command(
+        self, method: WiserRestActionEnum, url: str, command_data: dict
+    ) -> _WiserJournalCommand:
+        command = await self._command_journal.add(method.value, url, command_data)
+        self.metrics.increment("commands_queued")
+        _LOGGER.warning(
+            "Wiser hub unavailable. Command to %s queued for replay as command %s",
+            url,
+            command.seq,
+        )
+        return command
+
+    @property
+    def pending_commands(self) -> list[_WiserJournalCommand]:
+        """Get commands queued during a hub outage waiting to be replayed"""
+        return self._command_journal.pending if self._command_journal else []
+
+    async def replay_commands(self) -> int:
+        """
+        Send commands queued during a hub outage in order
+        Commands rejected by the hub are logged and discarded
+        return: number of commands replayed
+        """
+        if not self._command_journal:
+            return 0
+
+        async def send(method: str, url: str, command_data: dict):
+            try:
+                await self._do_hub_action(
+                    WiserRestActionEnum(method), WISERHUBDOMAIN + url, command_data
+                )
+            except WiserHubConnectionError as ex:
+                if self._is_hub_outage(ex):
+                    raise
+                _LOGGER.error("Queued command to %s was rejected by hub - %s", url, ex)
+
+        # Commands sent while a replay is running wait for it
+        async with self._replay_lock:
+            replayed = await self._command_journal.replay(send)
+        if replayed:
+            self.metrics.increment("commands_replayed", replayed)
+            _LOGGER.info("Replayed %s queued commands to Wiser hub", replayed)
+        return replayed
+
+    async def clear_pending_commands(self):
+        """Discard commands queued for replay"""
+        if self._command_journal:
+            await self._command_journal.clear()
 
     async def _do_schedule_action(
         self, action: WiserRestActionEnum, url: str, schedule_data: dict = None
@@ -339,7 +550,8 @@ class _WiserRestController(object):
             schedule_data,
         )
 
-        return await self._do_hub_action(action, url, schedule_data)
+        with self.tracer.span("command", url=url, method=action.value):
+            return await self._do_hub_action(action, url, schedule_data)
 
     async def _send_schedule_command(
         self,
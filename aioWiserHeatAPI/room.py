@@ -1,11 +1,15 @@
-import inspect
-from datetime import datetime
-from typing import Union
+import asyncio
+from bisect import bisect_left
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Union
 
 from aioWiserHeatAPI.helpers.capabilities import _WiserClimateCapabilities
 
 from . import _LOGGER
 from .const import (
+    ROOM_COMMAND_CONCURRENCY,
     TEMP_MINIMUM,
     TEMP_OFF,
     TEXT_BOOST,
@@ -15,14 +19,61 @@ from .const import (
     TEXT_UNKNOWN,
     WISER_BOOST_DURATION,
     WISERROOM,
+    WISERSYSTEM,
     WiserHeatingModeEnum,
     WiserPresetOptionsEnum,
 )
 from .devices import _WiserDeviceCollection
+from .exceptions import WiserExtraConfigError
 from .helpers.misc import is_value_in_list
+from .helpers.schedule_timeline import np, week_minute
 from .helpers.temp import _WiserTemperatureFunctions as tf
+from .helpers.tracing import caller_name
 from .rest_controller import WiserRestActionEnum, _WiserRestController
 from .schedule import _WiserSchedule, _WiserScheduleCollection
+from .system import _WiserSystem
+
+
+# Room methods that can be used with send_commands
+ROOM_BULK_ACTIONS = [
+    "boost",
+    "cancel_boost",
+    "cancel_overrides",
+    "schedule_advance",
+    "set_manual_temperature",
+    "set_mode",
+    "set_preset",
+    "set_target_temperature",
+    "set_target_temperature_for_duration",
+]
+
+
+@dataclass
+class _WiserRoomSetpointForecast:
+    """
+    Data structure for a multi room setpoint forecast.
+    Setpoints is a rooms x timesteps matrix (numpy array if available)
+    """
+
+    room_ids: list[int]
+    times: list[datetime]
+    setpoints: Any
+
+    def get_by_room_id(self, room_id: int) -> Any:
+        """Get forecast setpoints for a room"""
+        if room_id in self.room_ids:
+            return self.setpoints[self.room_ids.index(room_id)]
+        return None
+
+
+@dataclass
+class _WiserRoomCommandResult:
+    """Data structure for result of a room command sent in bulk"""
+
+    room_id: int
+    action: str
+    success: bool = False
+    error: str | None = None
 
 
 class _WiserRoom(object):
@@ -48,17 +99,7 @@ class _WiserRoom(object):
             if self._wiser_rest_controller._extra_config
             else None
         )
-        self._mode = self._effective_heating_mode(
-            self._data.get("Mode"), self.current_target_temperature
-        )
-
-        self._name = room.get("Name")
-        self._include_in_summer_comfort = room.get(
-            "IncludeInSummerComfort", False
-        )
-        self._window_detection_active = room.get(
-            "WindowDetectionActive", TEXT_UNKNOWN
-        )
+        self._update(room)
 
         self._default_extra_config = {
             "passive_mode": False,
@@ -66,12 +107,31 @@ class _WiserRoom(object):
             "max": 18,
         }
 
-        # Add device id to schedule
+        self._attach_schedule(schedule)
+
+    def _attach_schedule(self, schedule: _WiserSchedule | None):
+        """Set room schedule and add room to schedule assignments"""
+        self._schedule = schedule
         if self._schedule:
             self.schedule._assignments.append(
                 {"id": self.id, "name": self.name}
             )
 
+    def _update(self, room: dict):
+        """Update room with data read from hub"""
+        self._data = room
+        self._mode = self._effective_heating_mode(
+            self._data.get("Mode"), self.current_target_temperature
+        )
+
+        self._name = room.get("Name")
+        self._include_in_summer_comfort = room.get(
+            "IncludeInSummerComfort", False
+        )
+        self._window_detection_active = room.get(
+            "WindowDetectionActive", TEXT_UNKNOWN
+        )
+
     def _effective_heating_mode(self, mode: str, temp: float) -> str:
         if mode.casefold() == TEXT_MANUAL.casefold() and temp == TEMP_OFF:
             return WiserHeatingModeEnum.off.value
@@ -92,11 +152,13 @@ class _WiserRoom(object):
         result = await self._wiser_rest_controller._send_command(
             WISERROOM.format(self.id), cmd, method
         )
+        if isinstance(result, dict) and result.get("id") == self.id:
+            # Apply updated room returned by hub so changes show without a poll
+            self._data.update(result)
+            self._update(self._data)
         if result:
             _LOGGER.debug(
-                "Wiser room - {} command successful - {}".format(
-                    inspect.stack()[1].function, result
-                )
+                "Wiser room - %s command successful - %s", caller_name(), result
             )
             return True
         return False
@@ -389,6 +451,12 @@ class _WiserRoom(object):
             mode = mode.value
 
         if is_value_in_list(mode, self.available_modes):
+            if self._wiser_rest_controller._suppress_command(
+                mode == self.mode and not self.is_override,
+                f"{self.name} set_mode {mode}",
+            ):
+                return True
+
             # Cancel any overrides on mode change
             if self.is_override:
                 await self.cancel_overrides()
@@ -473,7 +541,7 @@ class _WiserRoom(object):
                 # Lookup boost duration
                 duration = WISER_BOOST_DURATION[preset]
                 _LOGGER.debug(
-                    f"Boosting by {self.boost_temperature_delta}C for {duration} mins"
+                    "Boosting by %sC for %s mins", self.boost_temperature_delta, duration
                 )
                 await self.boost(self.boost_temperature_delta, duration)
         else:
@@ -661,6 +729,14 @@ class _WiserRoom(object):
         param temp: the temperature to set in C
         return: boolean
         """
+        # In auto mode setting the scheduled temp still creates an override
+        if self._wiser_rest_controller._suppress_command(
+            temp == self.current_target_temperature
+            and (self.mode != WiserHeatingModeEnum.auto.value or self.is_override),
+            f"{self.name} set_target_temperature {temp}",
+        ):
+            return True
+
         # Set manual temp in stored config
         if (
             self.mode == WiserHeatingModeEnum.manual.value
@@ -741,12 +817,14 @@ class _WiserRoomCollection:
         schedules: _WiserScheduleCollection,
         devices: _WiserDeviceCollection,
         enable_automations: bool,
+        system: _WiserSystem | None = None,
     ):
         super().__init__()
         self._wiser_rest_controller = wiser_rest_controller
         self._room_data = room_data
         self._schedules = schedules
         self._devices = devices
+        self._system = system
         self._enable_automations = enable_automations
         self._rooms: list(_WiserRoom) = []
         self._build()
@@ -770,6 +848,24 @@ class _WiserRoomCollection:
                 )
             )
 
+    def _attach_schedules(self, schedules: list[_WiserSchedule]):
+        """
+        Set schedules of rooms built before schedule data was read
+        param schedules: heating schedules
+        """
+        self._schedules = schedules
+        for room in self._rooms:
+            room._attach_schedule(
+                next(
+                    (
+                        schedule
+                        for schedule in schedules
+                        if schedule.id == room._data.get("ScheduleId")
+                    ),
+                    None,
+                )
+            )
+
     @property
     def all(self) -> list[_WiserRoom]:
         """Returns list of room objects"""
@@ -780,6 +876,221 @@ class _WiserRoomCollection:
         """Number of rooms"""
         return len(self._rooms)
 
+    def _forecast_room(
+        self,
+        room: _WiserRoom,
+        times: list[datetime],
+        offsets,
+        schedule_settings: dict,
+        away_mode_temperature: float | None,
+    ):
+        """Get setpoint row for a room applying mode, away mode and overrides"""
+        steps = len(times)
+        if room.mode == WiserHeatingModeEnum.off.value:
+            return [TEMP_OFF] * steps
+
+        if room.mode == WiserHeatingModeEnum.auto.value and room.schedule:
+            # Evaluate each schedule once however many rooms use it
+            if room.schedule.id not in schedule_settings:
+                schedule_settings[room.schedule.id] = (
+                    room.schedule.timeline.settings_at_offsets(offsets)
+                )
+            row = schedule_settings[room.schedule.id]
+        elif room.mode == WiserHeatingModeEnum.manual.value:
+            row = [room.manual_target_temperature] * steps
+        else:
+            row = [room.current_target_temperature] * steps
+
+        row = np.array(row, dtype=float) if np is not None else list(row)
+
+        # Away mode limits setpoint to away temperature
+        if room.is_away_mode or (
+            away_mode_temperature is not None and not room.away_mode_suppressed
+        ):
+            limit = (
+                away_mode_temperature
+                if away_mode_temperature is not None
+                else room.current_target_temperature
+            )
+            if limit is not None:
+                row = (
+                    np.minimum(row, limit)
+                    if np is not None
+                    else [
+                        min(setpoint, limit) if setpoint is not None else None
+                        for setpoint in row
+                    ]
+                )
+
+        # Overrides, including boosts in away mode, apply until timeout or
+        # next schedule change in auto mode
+        if room.is_override:
+            end_time = room.boost_end_time
+            if (
+                end_time is None
+                and room.mode == WiserHeatingModeEnum.auto.value
+                and room.schedule
+            ):
+                next_change = room.schedule.get_next_change(times[0])
+                end_time = next_change.datetime if next_change else None
+            override_steps = (
+                bisect_left(times, end_time) if end_time is not None else steps
+            )
+            row[:override_steps] = [room.current_target_temperature] * override_steps
+        return row
+
+    def get_setpoint_forecast(
+        self,
+        start: datetime | None = None,
+        hours: int = 48,
+        step_minutes: int = 15,
+        away_mode_temperature: float | None = None,
+    ) -> _WiserRoomSetpointForecast:
+        """
+        Get the scheduled setpoint of every room at each time step in one batch.
+        Room modes, overrides and away mode are applied where they are known.
+        param start: start of forecast, defaults to now rounded down to step
+        param hours: length of forecast in hours
+        param step_minutes: minutes between each time step
+        param away_mode_temperature: away mode limit temp, defaults to the
+        system away mode limit if away mode is enabled
+        return: _WiserRoomSetpointForecast
+        """
+        if (
+            away_mode_temperature is None
+            and self._system
+            and self._system.away_mode_enabled
+        ):
+            away_mode_temperature = self._system.away_mode_target_temperature
+        if start is None:
+            now = datetime.now()
+            start = now.replace(
+                minute=now.minute - now.minute % step_minutes,
+                second=0,
+                microsecond=0,
+            )
+        steps = int(hours * 60 / step_minutes)
+        times = [start + timedelta(minutes=step_minutes * i) for i in range(steps)]
+        start_offset = week_minute(start)
+        offsets = (
+            start_offset + step_minutes * np.arange(steps)
+            if np is not None
+            else [start_offset + step_minutes * i for i in range(steps)]
+        )
+
+        schedule_settings = {}
+        rows = [
+            self._forecast_room(
+                room, times, offsets, schedule_settings, away_mode_temperature
+            )
+            for room in self._rooms
+        ]
+        return _WiserRoomSetpointForecast(
+            room_ids=[room.id for room in self._rooms],
+            times=times,
+            setpoints=(
+                np.array(rows, dtype=float).reshape(len(rows), steps)
+                if np is not None
+                else rows
+            ),
+        )
+
+    async def _send_system_room_command(
+        self, commands: dict[int, tuple]
+    ) -> list[_WiserRoomCommandResult] | None:
+        """
+        Send one system level command if the same boost or cancel
+        is requested for every room
+        param commands: dict of room id and action tuple
+        return: list of _WiserRoomCommandResult or None if not uniform
+        """
+        actions = set(commands.values())
+        if len(actions) != 1 or set(commands) != {room.id for room in self._rooms}:
+            return None
+        action = actions.pop()
+
+        if action[0] == "boost" and len(action) == 3 and action[2] > 0:
+            cmd = {
+                "Type": "Boost",
+                "DurationMinutes": action[2],
+                "IncreaseSetPointBy": tf._to_wiser_temp(action[1], "boostDelta"),
+            }
+        elif action[0] == "cancel_overrides" and len(action) == 1:
+            cmd = {"Type": "CancelUserOverrides"}
+        else:
+            return None
+
+        try:
+            success = bool(
+                await self._wiser_rest_controller._send_command(
+                    WISERSYSTEM, {"RequestOverride": cmd}
+                )
+            )
+            error = None
+        except Exception as ex:
+            success, error = False, str(ex)
+        return [
+            _WiserRoomCommandResult(room_id, action[0], success, error)
+            for room_id in commands
+        ]
+
+    async def send_commands(
+        self,
+        commands: dict[int, tuple],
+        max_concurrency: int = ROOM_COMMAND_CONCURRENCY,
+    ) -> list[_WiserRoomCommandResult]:
+        """
+        Send commands to many rooms at once.  If every room is given the same
+        boost or cancel_overrides action a single system command is used,
+        otherwise room commands are sent with bounded concurrency
+        param commands: dict of room id and action tuple of room method name and
+        args, ie {1: ("set_target_temperature", 21), 2: ("boost", 2, 30)}
+        param max_concurrency: max number of room commands to send at once
+        return: list of _WiserRoomCommandResult in order of commands
+        """
+        commands = {
+            room_id: tuple(action) if isinstance(action, (list, tuple)) else (action,)
+            for room_id, action in commands.items()
+        }
+        if results := await self._send_system_room_command(commands):
+            return results
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def send_command(room_id: int, action: tuple):
+            result = _WiserRoomCommandResult(room_id, action[0])
+            room = self.get_by_id(room_id)
+            if not room:
+                result.error = f"Room {room_id} does not exist"
+            elif action[0] not in ROOM_BULK_ACTIONS:
+                result.error = f"{action[0]} is not a valid room action"
+            else:
+                async with semaphore:
+                    try:
+                        result.success = bool(
+                            await getattr(room, action[0])(*action[1:])
+                        )
+                    except Exception as ex:
+                        result.error = str(ex)
+            return result
+
+        # Extra config changes made by room commands are written once
+        extra_config = self._wiser_rest_controller._extra_config
+        results = []
+        try:
+            async with (
+                extra_config.deferred_writes() if extra_config else nullcontext()
+            ):
+                results = await asyncio.gather(
+                    *[
+                        send_command(room_id, action)
+                        for room_id, action in commands.items()
+                    ]
+                )
+        except WiserExtraConfigError as ex:
+            _LOGGER.error("%s after sending room commands", ex)
+        return list(results)
+
     async def add(self, name):
         """
         Add new room
@@ -1,13 +1,17 @@
+import asyncio
+import gzip
+import hashlib
 import json
-import time
-from datetime import datetime, timedelta
+from dataclasses import dataclass, field
+from datetime import datetime, time as dt_time, timedelta
 
 import aiofiles
-import yaml
-from yaml import SafeDumper, SafeLoader
 
+from . import _LOGGER
 from .const import (
     DEFAULT_LEVEL_SCHEDULE,
+    SCHEDULE_ARCHIVE_VERSION,
+    SCHEDULE_RESTORE_CONCURRENCY,
     SPECIAL_DAYS,
     SPECIAL_TIMES,
     TEMP_MINIMUM,
@@ -28,6 +32,7 @@ from .const import (
     TEXT_WEEKENDS,
     WEEKDAYS,
     WEEKENDS,
+    WISERHUBSCHEDULES,
     WiserScheduleTypeEnum,
 )
 from .exceptions import (
@@ -36,6 +41,22 @@ from .exceptions import (
     WiserScheduleInvalidTime,
 )
 from .helpers.misc import file_exists, is_valid_level
+from .helpers.schedule_codec import (
+    SCHEDULE_DAYS,
+    SPECIAL_TIME_NAMES,
+    format_hub_time,
+    is_valid_clock_time,
+    parse_clock_time,
+    yaml_dump,
+    yaml_load,
+)
+from .helpers.schedule_timeline import (
+    WEEK_DAYS,
+    _WiserScheduleTimeline,
+    _WiserScheduleTimelineEntry,
+    clock_time_to_minutes,
+    hub_time_to_minutes,
+)
 from .helpers.temp import _WiserTemperatureFunctions as tf
 from .rest_controller import _WiserRestController
 
@@ -55,17 +76,18 @@ class _WiserScheduleNext:
     @property
     def time(self) -> datetime:
         """Get the next entry time"""
-        t = f'{self._data.get("Time", 0):04}'
-        return datetime.strptime(t[:2] + ":" + t[-2:], "%H:%M").time()
+        t = int(self._data.get("Time", 0))
+        return dt_time(t // 100, t % 100)
 
     @property
     def datetime(self) -> datetime:
         """Get the next entry date time"""
         try:
-            next_schedule_day = (WEEKDAYS + WEEKENDS).index(self.day)
+            next_schedule_day = WEEK_DAYS.index(self.day)
             next_schedule_time = self.time
-            current_day = datetime.today().weekday()
-            current_time = datetime.now().time()
+            now = datetime.now()
+            current_day = now.weekday()
+            current_time = now.time()
 
             # If next day or time on earlier weekday, add week to date
             days_diff = next_schedule_day - current_day
@@ -76,10 +98,10 @@ class _WiserScheduleNext:
                 and next_schedule_time >= current_time
                 else days_diff + 7
             )
-            next_date = datetime.today() + timedelta(days=days_diff)
+            next_date = now + timedelta(days=days_diff)
             return next_date.replace(
-                hour=self.time.hour,
-                minute=self.time.minute,
+                hour=next_schedule_time.hour,
+                minute=next_schedule_time.minute,
                 second=0,
                 microsecond=0,
             )
@@ -98,6 +120,50 @@ class _WiserScheduleNext:
         return None
 
 
+@dataclass(frozen=True)
+class _WiserScheduleWriteResult:
+    """
+    Data structure for result of a schedule write.
+    Always evaluates as True as failed writes raise WiserScheduleError
+    """
+
+    schedule_id: int
+    written: bool
+    days: list[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return True
+
+
+@dataclass
+class _WiserScheduleRestoreResult:
+    """Data structure for result of restoring a schedule from a backup"""
+
+    schedule_id: int
+    name: str
+    schedule_type: str
+    written: bool = False
+    days: list[str] = field(default_factory=list)
+    assignments_updated: bool = False
+    verified: bool | None = None
+    error: str | None = None
+
+    @property
+    def success(self) -> bool:
+        """Get if schedule restored without error or failed verification"""
+        return self.error is None and self.verified is not False
+
+
+@dataclass
+class _WiserScheduleConsolidationResult:
+    """Data structure for result of consolidating duplicate schedules"""
+
+    schedule_id: int
+    schedule_type: str
+    assignment_ids: list[int] = field(default_factory=list)
+    deleted_ids: list[int] = field(default_factory=list)
+
+
 class _WiserSchedule:
     """Class representing a wiser Schedule"""
 
@@ -116,6 +182,10 @@ class _WiserSchedule:
         self._sunsets = sunsets
         self._assignments = []
         self._device_ids = []
+        self._timeline: _WiserScheduleTimeline | None = None
+        self._ws_schedule_data: dict | None = None
+        # Set by schedule collection
+        self._collection: "_WiserScheduleCollection | None" = None
 
     def _validate_schedule_type(self, schedule_data: dict) -> bool:
         return (
@@ -126,11 +196,7 @@ class _WiserSchedule:
         )
 
     def _is_valid_time(self, time_value: str) -> bool:
-        try:
-            time.strptime(time_value, "%H:%M")
-            return True
-        except Exception:
-            return False
+        return is_valid_clock_time(time_value)
 
     def _ensure_type(self, schedule_data: dict) -> dict:
         if not schedule_data.get("Type"):
@@ -175,6 +241,71 @@ class _WiserSchedule:
         """
         return None
 
+    def _compile_day(self, day: str, day_schedule) -> list[tuple[int, object]]:
+        """
+        Convert a wiser day schedule to a list of minute of day and setting pairs
+        param day: day of the week
+        param day_schedule: json schedule for a day in wiser v2 format
+        return: list of tuples
+        """
+        return []
+
+    def _canonical_day(self, day_schedule) -> list:
+        """
+        Convert a wiser day schedule to a canonical sorted form for comparison
+        param day_schedule: json schedule for a day in wiser v2 format
+        return: list
+        """
+        return day_schedule
+
+    def _day_hashes(self, schedule_data: dict) -> dict[str, str]:
+        """
+        Get content hash of each day of a wiser format schedule
+        param schedule_data: json schedule data in wiser v2 format
+        return: dict of day name and hash
+        """
+        day_hashes = {}
+        for day, day_schedule in schedule_data.items():
+            if day.title() in WEEK_DAYS:
+                day_hashes[day.title()] = hashlib.sha1(
+                    json.dumps(
+                        self._canonical_day(day_schedule), separators=(",", ":")
+                    ).encode("utf-8")
+                ).hexdigest()
+        return day_hashes
+
+    def _changed_days(self, schedule_data: dict) -> list[str]:
+        """
+        Get days of a wiser format schedule that differ from current schedule
+        param schedule_data: json schedule data in wiser v2 format
+        return: list of day names
+        """
+        current_hashes = self._day_hashes(self.schedule_data)
+        return [
+            day
+            for day, day_hash in self._day_hashes(schedule_data).items()
+            if current_hashes.get(day) != day_hash
+        ]
+
+    def _update_local_schedule(self, schedule_data: dict):
+        """Apply written schedule days to local schedule data"""
+        for day, day_schedule in schedule_data.items():
+            self._schedule_data[day.title()] = day_schedule
+        self._timeline = None
+        self._ws_schedule_data = None
+
+    def _compile_timeline(self) -> _WiserScheduleTimeline:
+        """Compile schedule data into a weekly timeline"""
+        entries = []
+        schedule_data = self.schedule_data
+        for day_index, day in enumerate(WEEK_DAYS):
+            if day_schedule := schedule_data.get(day):
+                entries.extend(
+                    (day_index * 1440 + minute, setting)
+                    for minute, setting in self._compile_day(day, day_schedule)
+                )
+        return _WiserScheduleTimeline(entries)
+
     def _convert_from_wiser_schedule(
         self,
         schedule_data: dict,
@@ -195,7 +326,7 @@ class _WiserSchedule:
         # Iterate through each day
         try:
             for day, sched in schedule_data.items():
-                if day.title() in (WEEKDAYS + WEEKENDS + SPECIAL_DAYS):
+                if day.title() in SCHEDULE_DAYS:
                     schedule_set_points = self._convert_wiser_to_yaml_day(
                         day, sched, replace_special_times, generic_setpoint
                     )
@@ -213,7 +344,7 @@ class _WiserSchedule:
         schedule_output = {}
         try:
             for day, sched in schedule_data.items():
-                if day.title() in (WEEKDAYS + WEEKENDS + SPECIAL_DAYS):
+                if day.title() in SCHEDULE_DAYS:
                     schedule_day = self._convert_yaml_to_wiser_day(sched)
                     # If using special days, convert to one entry for each weekday
                     if day.title() in SPECIAL_DAYS:
@@ -247,6 +378,9 @@ class _WiserSchedule:
             result = await self._wiser_rest_controller._send_schedule_command(
                 action, schedule_data, (id if id != 0 else self.id), self._type
             )
+            if action == "ASSIGN":
+                # Cached webservice data includes assignments
+                self._ws_schedule_data = None
             return result
         except Exception as ex:
             raise WiserScheduleError(ex)
@@ -317,38 +451,96 @@ class _WiserSchedule:
 
     @property
     def ws_schedule_data(self) -> dict:
-        """Get formatted schedule data for webservice support"""
-        s = self._remove_schedule_elements(
-            self._convert_from_wiser_schedule(self.schedule_data, generic_setpoint=True)
-        )
-        return {
-            "Id": self.id,
-            "Name": self.name,
-            "Type": self._type,
-            "SubType": self.schedule_type,
-            "Assignments": self.assignments,
-            "ScheduleData": [{"day": a, "slots": s.get(a)} for a in s],
-        }
+        """
+        Get formatted schedule data for webservice support
+        return: dict shared by all callers, treat as read only
+        """
+        # Cached for life of this schedule data snapshot
+        if self._ws_schedule_data is None:
+            s = self._remove_schedule_elements(
+                self._convert_from_wiser_schedule(
+                    self.schedule_data, generic_setpoint=True
+                )
+            )
+            self._ws_schedule_data = {
+                "Id": self.id,
+                "Name": self.name,
+                "Type": self._type,
+                "SubType": self.schedule_type,
+                "Assignments": self.assignments,
+                "ScheduleData": [{"day": a, "slots": s.get(a)} for a in s],
+            }
+        return self._ws_schedule_data
 
     @property
     def schedule_type(self) -> str:
         """Get schedule type (heating, on/off or level)"""
         return self._type
 
-    async def copy_schedule(self, to_id: int) -> bool:
+    @property
+    def schedule_hash(self) -> str:
+        """Get content hash of schedule days for change detection"""
+        return hashlib.sha1(
+            json.dumps(self._day_hashes(self.schedule_data), sort_keys=True).encode(
+                "utf-8"
+            )
+        ).hexdigest()
+
+    @property
+    def timeline(self) -> _WiserScheduleTimeline:
+        """Get compiled weekly timeline of schedule"""
+        if self._timeline is None:
+            self._timeline = self._compile_timeline()
+        return self._timeline
+
+    def get_setting_at(self, when: datetime) -> float | str | int | None:
+        """
+        Get scheduled setting at a time calculated locally from schedule data
+        param when: datetime to get setting for
+        return: temp for heating, state for on/off, level for level schedules
+        """
+        return self.timeline.setting_at(when)
+
+    def get_next_change(
+        self, when: datetime | None = None
+    ) -> _WiserScheduleTimelineEntry | None:
+        """
+        Get next schedule entry after a time calculated locally from schedule data
+        param when: datetime to get next entry after.  Defaults to now
+        return: _WiserScheduleTimelineEntry
+        """
+        return self.timeline.next_change(when or datetime.now())
+
+    def get_day_timeline(self, day: str) -> list[_WiserScheduleTimelineEntry]:
+        """
+        Get all settings for a day including setting in force at midnight
+        param day: day of the week
+        return: list of _WiserScheduleTimelineEntry
+        """
+        return self.timeline.day_timeline(day)
+
+    async def copy_schedule(self, to_id: int) -> _WiserScheduleWriteResult:
         """
         Copy this schedule to another schedule
         param toId: id of schedule to copy to
-        return: boolen - true = successfully set, false = failed to set
+        return: _WiserScheduleWriteResult - written is false if no change was needed
         """
-        try:
-            await self._send_schedule_command(
-                "UPDATE",
-                self._remove_schedule_elements(self._schedule_data.copy()),
-                to_id,
+        to_schedule = next(
+            (
+                schedule
+                for schedule in (self._collection.all if self._collection else [])
+                if schedule._type == self._type and schedule.id == to_id
+            ),
+            None,
+        )
+        if not to_schedule:
+            raise WiserScheduleError(
+                f"Error copying schedule - invalid schedule id {to_id}"
             )
-            return True
-        except Exception as ex:
+        # Set via target schedule to skip write if already the same
+        try:
+            return await to_schedule.set_schedule(self.schedule_data)
+        except WiserScheduleError as ex:
             raise WiserScheduleError(f"Error copying schedule - {ex}")
 
     async def delete_schedule(self) -> bool:
@@ -387,29 +579,51 @@ class _WiserSchedule:
         """
         try:
             async with aiofiles.open(schedule_yaml_file, "w") as file:
-                output = yaml.dump(
-                    self._convert_from_wiser_schedule(self._schedule_data),
-                    default_flow_style=False,
-                    allow_unicode=True,
-                    sort_keys=False,
-                    Dumper=SafeDumper,
-                ).replace(": null\n", ":\n")
+                output = yaml_dump(
+                    self._convert_from_wiser_schedule(self._schedule_data)
+                )
                 await file.write(output)
             return True
         except Exception as ex:
             raise WiserScheduleError(f"Error saving schedule to yaml file - {ex}")
 
-    async def set_schedule(self, schedule_data: dict) -> bool:
+    async def set_schedule(
+        self, schedule_data: dict, force: bool = False
+    ) -> _WiserScheduleWriteResult:
         """
-        Set new schedule
+        Set new schedule.  Only days that differ from the current schedule are sent
+        and no write is made if the schedule is unchanged.
         param scheduleData: json data respresenting a schedule
-        return: boolen - true = successfully set, false = failed to set
+        param force: send full schedule even if unchanged
+        return: _WiserScheduleWriteResult - written is false if no change was needed
         """
         try:
-            await self._send_schedule_command(
-                "UPDATE", self._remove_schedule_elements(schedule_data)
+            schedule_data = self._remove_schedule_elements(schedule_data)
+            if force:
+                changed_days = [
+                    day for day in schedule_data if day.title() in WEEK_DAYS
+                ]
+                update_data = schedule_data
+            else:
+                changed_days = self._changed_days(schedule_data)
+                update_data = {
+                    day: day_schedule
+                    for day, day_schedule in schedule_data.items()
+                    if day.title() in changed_days or day.title() not in WEEK_DAYS
+                }
+
+            if not changed_days and not force:
+                return _WiserScheduleWriteResult(self.id, False)
+
+            await self._send_schedule_command("UPDATE", update_data)
+            self._update_local_schedule(
+                {
+                    day: day_schedule
+                    for day, day_schedule in update_data.items()
+                    if day.title() in WEEK_DAYS
+                }
             )
-            return True
+            return _WiserScheduleWriteResult(self.id, True, changed_days)
         except Exception as ex:
             raise WiserScheduleError(f"Error setting schedule - {ex}")
 
@@ -417,7 +631,7 @@ class _WiserSchedule:
         """
         Set schedule from file.
         param schedule_file: file of json data respresenting a schedule
-        return: boolen - true = successfully set, false = failed to set
+        return: _WiserScheduleWriteResult - written is false if no change was needed
         """
         try:
             if await file_exists(schedule_file):
@@ -425,10 +639,9 @@ class _WiserSchedule:
                     contents = await f.read()
                     schedule_data = json.loads(contents)
                     if self._validate_schedule_type(schedule_data):
-                        await self.set_schedule(
+                        return await self.set_schedule(
                             self._remove_schedule_elements(schedule_data)
                         )
-                        return True
                     else:
                         raise WiserScheduleError(
                             f"{schedule_data.get('Type', TEXT_UNKNOWN)} is an incorrect schedule type for this device.  It should be a {self.schedule_type} schedule."
@@ -444,14 +657,13 @@ class _WiserSchedule:
         """
         Set new schedule
         param scheduleData: json data respresenting a schedule
-        return: boolen - true = successfully set, false = failed to set
+        return: _WiserScheduleWriteResult - written is false if no change was needed
         """
         try:
-            schedule_data = yaml.load(schedule_data, SafeLoader)
+            schedule_data = yaml_load(schedule_data)
             if self._validate_schedule_type(schedule_data):
                 schedule = self._convert_to_wiser_schedule(schedule_data)
-                await self.set_schedule(schedule)
-                return True
+                return await self.set_schedule(schedule)
             else:
                 raise WiserScheduleError(
                     f"This is an incorrect schedule type for this device.  It should be a {self.schedule_type} schedule."
@@ -463,16 +675,15 @@ class _WiserSchedule:
         """
         Set schedule from file.
         param schedule_file: file of yaml data respresenting a schedule
-        return: boolen - true = successfully set, false = failed to set
+        return: _WiserScheduleWriteResult - written is false if no change was needed
         """
         try:
             async with aiofiles.open(schedule_yaml_file, "r") as file:
                 contents = await file.read()
-                schedule_data = yaml.load(contents, SafeLoader)
+                schedule_data = yaml_load(contents)
                 if self._validate_schedule_type(schedule_data):
                     schedule = self._convert_to_wiser_schedule(schedule_data)
-                    await self.set_schedule(schedule)
-                    return True
+                    return await self.set_schedule(schedule)
                 else:
                     raise WiserScheduleError(
                         f"This is an incorrect schedule type for this device.  It should be a {self.schedule_type} schedule."
@@ -484,7 +695,7 @@ class _WiserSchedule:
         """
         Set schedule from websocket data.
         param schedule: data respresenting a schedule
-        return: boolen - true = successfully set, false = failed to set
+        return: _WiserScheduleWriteResult - written is false if no change was needed
         """
         try:
             if self._validate_schedule_type(schedule_data):
@@ -492,8 +703,7 @@ class _WiserSchedule:
                 for entry in schedule_data.get("ScheduleData"):
                     schedule_json.update({entry.get("day"): entry.get("slots")})
                 schedule = self._convert_to_wiser_schedule(schedule_json)
-                await self.set_schedule(schedule)
-                return True
+                return await self.set_schedule(schedule)
             else:
                 raise WiserScheduleError(
                     f"{schedule_data.get('Type', TEXT_UNKNOWN)} is an incorrect schedule type for this device.  It should be a {self.schedule_type} schedule."
@@ -568,21 +778,44 @@ class _WiserHeatingSchedule(_WiserSchedule):
         param daySchedule: json schedule for a day in wiser v2 format
         return: json
         """
-        schedule_set_points = []
-        for i in range(len(day_schedule[TEXT_TIME])):
-            schedule_set_points.append(
-                {
-                    TEXT_TIME: (
-                        datetime.strptime(
-                            format(day_schedule[TEXT_TIME][i], "04d"), "%H%M"
-                        )
-                    ).strftime("%H:%M"),
-                    (
-                        TEXT_SETPOINT if generic_setpoint else TEXT_TEMP
-                    ): tf._from_wiser_temp(day_schedule[TEXT_DEGREESC][i]),
-                }
+        setting_key = TEXT_SETPOINT if generic_setpoint else TEXT_TEMP
+        schedule_set_points = [
+            {
+                TEXT_TIME: format_hub_time(hub_time),
+                setting_key: tf._from_wiser_temp(temp),
+            }
+            for hub_time, temp in zip(
+                day_schedule[TEXT_TIME], day_schedule[TEXT_DEGREESC]
             )
-        return sorted(schedule_set_points, key=lambda t: t["Time"])
+        ]
+        return sorted(schedule_set_points, key=lambda t: t[TEXT_TIME])
+
+    def _canonical_day(self, day_schedule) -> list:
+        """
+        Convert a wiser day schedule to a canonical sorted form for comparison
+        param day_schedule: json schedule for a day in wiser v2 format
+        return: list
+        """
+        return sorted(
+            (int(hub_time), int(temp))
+            for hub_time, temp in zip(
+                day_schedule.get(TEXT_TIME, []), day_schedule.get(TEXT_DEGREESC, [])
+            )
+        )
+
+    def _compile_day(self, day: str, day_schedule) -> list[tuple[int, float]]:
+        """
+        Convert a wiser day schedule to a list of minute of day and temp pairs
+        param day: day of the week
+        param day_schedule: json schedule for a day in wiser v2 format
+        return: list of tuples
+        """
+        return [
+            (hub_time_to_minutes(hub_time), tf._from_wiser_temp(temp))
+            for hub_time, temp in zip(
+                day_schedule.get(TEXT_TIME, []), day_schedule.get(TEXT_DEGREESC, [])
+            )
+        ]
 
     def _convert_yaml_to_wiser_day(self, day_schedule) -> list:
         """
@@ -596,9 +829,8 @@ class _WiserHeatingSchedule(_WiserSchedule):
         for item in day_schedule:
             for key, value in item.items():
                 if key.title() == TEXT_TIME:
-                    if self._is_valid_time(value):
-                        time = str(value).replace(":", "")
-                        times.append(time)
+                    if is_valid_clock_time(value):
+                        times.append(str(value).replace(":", ""))
                     else:
                         raise WiserScheduleInvalidTime(f"Invalid time value - {value}")
                 if key.title() in [TEXT_TEMP, TEXT_SETPOINT]:
@@ -690,29 +922,44 @@ class _WiserOnOffSchedule(_WiserSchedule):
         param daySchedule: json schedule for a day in wiser v2 format
         return: json
         """
-        schedule_set_points = []
-        for i in range(len(day_schedule)):
-            schedule_set_points.append(
-                {
-                    TEXT_TIME: (
-                        datetime.strptime(
-                            format(
-                                abs(
-                                    day_schedule[i]
-                                    if abs(day_schedule[i]) < 2400
-                                    else 0
-                                ),
-                                "04d",
-                            ),
-                            "%H%M",
-                        )
-                    ).strftime("%H:%M"),
-                    (TEXT_SETPOINT if generic_setpoint else TEXT_STATE): (
-                        TEXT_ON if day_schedule[i] == abs(day_schedule[i]) else TEXT_OFF
-                    ),
-                }
+        setting_key = TEXT_SETPOINT if generic_setpoint else TEXT_STATE
+        schedule_set_points = [
+            {
+                TEXT_TIME: format_hub_time(
+                    abs(hub_time) if abs(hub_time) < 2400 else 0
+                ),
+                setting_key: TEXT_ON if hub_time >= 0 else TEXT_OFF,
+            }
+            for hub_time in (int(entry) for entry in day_schedule)
+        ]
+        return sorted(schedule_set_points, key=lambda t: t[TEXT_TIME])
+
+    def _canonical_day(self, day_schedule) -> list:
+        """
+        Convert a wiser day schedule to a canonical sorted form for comparison
+        param day_schedule: json schedule for a day in wiser v2 format
+        return: list
+        """
+        return sorted(
+            (int(hub_time) for hub_time in day_schedule),
+            key=lambda hub_time: (abs(hub_time) % 2400, hub_time),
+        )
+
+    def _compile_day(self, day: str, day_schedule) -> list[tuple[int, str]]:
+        """
+        Convert a wiser day schedule to a list of minute of day and state pairs
+        Off entries are negative times with -2400 representing midnight
+        param day: day of the week
+        param day_schedule: json schedule for a day in wiser v2 format
+        return: list of tuples
+        """
+        return [
+            (
+                hub_time_to_minutes(abs(hub_time) if abs(hub_time) < 2400 else 0),
+                TEXT_ON if hub_time == abs(hub_time) else TEXT_OFF,
             )
-        return sorted(schedule_set_points, key=lambda t: t["Time"])
+            for hub_time in (int(entry) for entry in day_schedule)
+        ]
 
     def _convert_yaml_to_wiser_day(self, day_schedule) -> list:
         """
@@ -726,9 +973,8 @@ class _WiserOnOffSchedule(_WiserSchedule):
         for item in day_schedule:
             for key, value in item.items():
                 if key.title() == TEXT_TIME:
-                    if self._is_valid_time(value):
-                        time = int(str(value).replace(":", ""))
-                    else:
+                    time = parse_clock_time(value)
+                    if time is None:
                         raise WiserScheduleInvalidTime(f"Invalid time value - {value}")
                 if key.title() in [TEXT_STATE, TEXT_SETPOINT]:
                     if value.title() in [TEXT_ON, TEXT_OFF]:
@@ -850,55 +1096,63 @@ class _WiserLevelSchedule(_WiserSchedule):
         param daySchedule: json schedule for a day in wiser v2 format
         return: json
         """
+        setting_key = TEXT_SETPOINT if generic_setpoint else TEXT_LEVEL
         schedule_set_points = []
-        for i in range(len(day_schedule[TEXT_TIME])):
-            if day_schedule[TEXT_TIME][i] in SPECIAL_TIMES.values():
+        for hub_time, level in zip(day_schedule[TEXT_TIME], day_schedule[TEXT_LEVEL]):
+            hub_time = int(hub_time)
+            if special_time := SPECIAL_TIME_NAMES.get(hub_time):
                 if replace_special_times:
-                    schedule_set_points.append(
-                        {
-                            TEXT_TIME: (
-                                self._sunrises.get(day)
-                                if day_schedule[TEXT_TIME][i]
-                                == SPECIAL_TIMES.get("Sunrise")
-                                else self._sunsets.get(day)
-                            ),
-                            (
-                                TEXT_SETPOINT if generic_setpoint else TEXT_LEVEL
-                            ): day_schedule[TEXT_LEVEL][i],
-                        }
-                    )
-                else:
-                    schedule_set_points.append(
-                        {
-                            TEXT_TIME: (
-                                [
-                                    name
-                                    for name, time in SPECIAL_TIMES.items()
-                                    if time == day_schedule[TEXT_TIME][i]
-                                ][0]
-                            ),
-                            (
-                                TEXT_SETPOINT if generic_setpoint else TEXT_LEVEL
-                            ): day_schedule[TEXT_LEVEL][i],
-                        }
+                    special_time = (
+                        self._sunrises.get(day)
+                        if hub_time == SPECIAL_TIMES["Sunrise"]
+                        else self._sunsets.get(day)
                     )
+                schedule_set_points.append(
+                    {TEXT_TIME: special_time, setting_key: level}
+                )
             else:
                 schedule_set_points.append(
-                    {
-                        TEXT_TIME: (
-                            datetime.strptime(
-                                format(day_schedule[TEXT_TIME][i], "04d"),
-                                "%H%M",
-                            )
-                        ).strftime("%H:%M"),
-                        (
-                            TEXT_SETPOINT if generic_setpoint else TEXT_LEVEL
-                        ): day_schedule[TEXT_LEVEL][i],
-                    }
+                    {TEXT_TIME: format_hub_time(hub_time), setting_key: level}
                 )
         # Sort list into time order
         return sorted(schedule_set_points, key=lambda t: t["Time"])
 
+    def _canonical_day(self, day_schedule) -> list:
+        """
+        Convert a wiser day schedule to a canonical sorted form for comparison
+        param day_schedule: json schedule for a day in wiser v2 format
+        return: list
+        """
+        return sorted(
+            (int(hub_time), int(level))
+            for hub_time, level in zip(
+                day_schedule.get(TEXT_TIME, []), day_schedule.get(TEXT_LEVEL, [])
+            )
+        )
+
+    def _compile_day(self, day: str, day_schedule) -> list[tuple[int, int]]:
+        """
+        Convert a wiser day schedule to a list of minute of day and level pairs
+        Sunrise and sunset entries are resolved from the hub sun times
+        param day: day of the week
+        param day_schedule: json schedule for a day in wiser v2 format
+        return: list of tuples
+        """
+        entries = []
+        for hub_time, level in zip(
+            day_schedule.get(TEXT_TIME, []), day_schedule.get(TEXT_LEVEL, [])
+        ):
+            hub_time = int(hub_time)
+            if hub_time == SPECIAL_TIMES["Sunrise"]:
+                minute = clock_time_to_minutes(self._sunrises.get(day))
+            elif hub_time == SPECIAL_TIMES["Sunset"]:
+                minute = clock_time_to_minutes(self._sunsets.get(day))
+            else:
+                minute = hub_time_to_minutes(hub_time)
+            if minute is not None:
+                entries.append((minute, level))
+        return entries
+
     def _convert_yaml_to_wiser_day(self, day_schedule) -> list:
         """
         Convert from yaml format to wiser v2 schedule format.
@@ -910,15 +1164,14 @@ class _WiserLevelSchedule(_WiserSchedule):
         for entry in day_schedule:
             for key, value in entry.items():
                 if key.title() == TEXT_TIME:
-                    if value.title() in SPECIAL_TIMES.keys():
+                    if value.title() in SPECIAL_TIMES:
                         time = SPECIAL_TIMES[value.title()]
+                    elif is_valid_clock_time(value):
+                        time = str(value).replace(":", "")
                     else:
-                        if self._is_valid_time(value):
-                            time = str(value).replace(":", "")
-                        else:
-                            raise WiserScheduleInvalidTime(
-                                f"Invalid time value - {value}"
-                            )
+                        raise WiserScheduleInvalidTime(
+                            f"Invalid time value - {value}"
+                        )
                     times.append(time)
                 if key.title() in [TEXT_LEVEL, TEXT_SETPOINT]:
                     if is_valid_level(int(value)):
@@ -954,34 +1207,42 @@ class _WiserScheduleCollection(object):
             for schedule in schedule_data.get(schedule_type):
                 if schedule_type == WiserScheduleTypeEnum.heating.value:
                     self._heating_schedules.append(
-                        _WiserHeatingSchedule(
-                            self._wiser_rest_controller,
-                            schedule_type,
-                            schedule,
-                            self._sunrises,
-                            self._sunsets,
-                        )
+                        self._new_schedule(schedule_type, schedule)
                     )
                 if schedule_type == WiserScheduleTypeEnum.onoff.value:
                     self._onoff_schedules.append(
-                        _WiserOnOffSchedule(
-                            self._wiser_rest_controller,
-                            schedule_type,
-                            schedule,
-                            self._sunrises,
-                            self._sunsets,
-                        )
+                        self._new_schedule(schedule_type, schedule)
                     )
                 if schedule_type == WiserScheduleTypeEnum.level.value:
                     self._level_schedules.append(
-                        _WiserLevelSchedule(
-                            self._wiser_rest_controller,
-                            schedule_type,
-                            schedule,
-                            self._sunrises,
-                            self._sunsets,
-                        )
+                        self._new_schedule(schedule_type, schedule)
                     )
+        for schedule in self.all:
+            schedule._collection = self
+
+    def _new_schedule(
+        self, schedule_type: str, schedule_data: dict
+    ) -> _WiserHeatingSchedule | _WiserLevelSchedule | _WiserOnOffSchedule | None:
+        """
+        Create schedule object from hub schedule data
+        param schedule_type: Heating, OnOff or Level
+        param schedule_data: json schedule data
+        return: _WiserSchedule object or None if unknown type
+        """
+        schedule_class = {
+            WiserScheduleTypeEnum.heating.value: _WiserHeatingSchedule,
+            WiserScheduleTypeEnum.onoff.value: _WiserOnOffSchedule,
+            WiserScheduleTypeEnum.level.value: _WiserLevelSchedule,
+        }.get(schedule_type)
+        if schedule_class:
+            return schedule_class(
+                self._wiser_rest_controller,
+                schedule_type,
+                schedule_data,
+                self._sunrises,
+                self._sunsets,
+            )
+        return None
 
     async def _send_schedule_command(
         self, action: str, schedule_data: dict, id: int = 0
@@ -1136,14 +1397,18 @@ class _WiserScheduleCollection(object):
         Copy schedule of same type between schedule Ids
         param from_id: id of the schedule to copy
         param to_id: id of the schedule to copy to
-        return: True if succeeded, false if failed
+        return: _WiserScheduleWriteResult - written is false if no change was needed
         """
         from_schedule = self.get_by_id(schedule_type, from_id)
         to_schedule = self.get_by_id(schedule_type, to_id)
 
         if from_schedule and to_schedule:
             if from_schedule.schedule_type == to_schedule.schedule_type:
-                return await from_schedule.copy_schedule(to_id)
+                # Set via target schedule to skip write if already the same
+                try:
+                    return await to_schedule.set_schedule(from_schedule.schedule_data)
+                except WiserScheduleError as ex:
+                    raise WiserScheduleError(f"Error copying schedule - {ex}")
             else:
                 raise WiserScheduleError(
                     f"You cannot copy from {from_schedule.schedule_type} to {to_schedule.schedule_type} schedules.  They must be of the same type"
@@ -1159,12 +1424,14 @@ class _WiserScheduleCollection(object):
         schedule_type: WiserScheduleTypeEnum,
         name: str,
         assignments: list = [],
+        schedule_data: dict | None = None,
     ) -> bool:
         """
         Create a new schedule entry
         param schedule_type: type of schedule to create
         param name: name of schedule
         param assignments: optional - assign new schedule to list of rooms or devices
+        param schedule_data: optional - day schedules of new schedule in wiser format
         """
         type_data = {"Name": name}
         if schedule_type in [
@@ -1180,9 +1447,278 @@ class _WiserScheduleCollection(object):
             type_data.update(DEFAULT_LEVEL_SCHEDULE)
             schedule_type = WiserScheduleTypeEnum.level
 
+        if schedule_data:
+            type_data.update(
+                {
+                    day.title(): day_schedule
+                    for day, day_schedule in schedule_data.items()
+                    if day.title() in WEEK_DAYS
+                }
+            )
+
         schedule_data = {
             "Assignments": assignments,
             schedule_type.value: type_data,
         }
 
         return await self._send_schedule_command("CREATE", schedule_data)
+
+    def _get_archive_schedule(
+        self, entry: dict
+    ) -> _WiserHeatingSchedule | _WiserLevelSchedule | _WiserOnOffSchedule | None:
+        """Find schedule matching a backup archive entry by id then name"""
+        try:
+            schedule_type = WiserScheduleTypeEnum(entry.get("SubType"))
+        except ValueError:
+            return None
+        return self.get_by_id(schedule_type, entry.get("id")) or self.get_by_name(
+            schedule_type, entry.get("Name")
+        )
+
+    async def save_schedules_to_file(self, backup_file: str) -> int:
+        """
+        Save all heating, onoff and level schedules and their assignments
+        to a single compressed backup file
+        param backup_file: file to write backup to
+        return: number of schedules saved
+        """
+        archive = {
+            "Version": SCHEDULE_ARCHIVE_VERSION,
+            "Created": datetime.now().isoformat(timespec="seconds"),
+            "Schedules": [
+                {
+                    "Type": schedule._type,
+                    "SubType": schedule.schedule_type,
+                    "id": schedule.id,
+                    "Name": schedule.name,
+                    "Assignments": schedule.assignment_ids,
+                    "ScheduleData": schedule.schedule_data,
+                }
+                for schedule in self.all
+            ],
+        }
+        try:
+            async with aiofiles.open(backup_file, "wb") as file:
+                await file.write(
+                    gzip.compress(
+                        json.dumps(archive, separators=(",", ":")).encode("utf-8")
+                    )
+                )
+            return len(archive["Schedules"])
+        except Exception as ex:
+            raise WiserScheduleError(f"Error saving schedules to file - {ex}")
+
+    async def restore_schedules_from_file(
+        self,
+        backup_file: str,
+        max_concurrency: int = SCHEDULE_RESTORE_CONCURRENCY,
+        restore_assignments: bool = True,
+        verify: bool = True,
+    ) -> list[_WiserScheduleRestoreResult]:
+        """
+        Restore schedules from a backup file made with save_schedules_to_file.
+        Schedules are restored concurrently and unchanged schedules are skipped.
+        Schedules no longer on the hub are created with their backup content
+        param backup_file: backup file to restore from
+        param max_concurrency: max number of schedules to restore at once
+        param restore_assignments: reassign schedules to rooms/devices in backup
+        param verify: re-read schedules from hub after restore and compare
+        return: list of _WiserScheduleRestoreResult for each schedule in backup
+        """
+        try:
+            if not await file_exists(backup_file):
+                raise WiserScheduleError(f"{backup_file} does not exist")
+            async with aiofiles.open(backup_file, "rb") as file:
+                archive = json.loads(gzip.decompress(await file.read()))
+            if archive.get("Version") != SCHEDULE_ARCHIVE_VERSION:
+                raise WiserScheduleError(
+                    f"Unsupported backup version {archive.get('Version')}"
+                )
+        except Exception as ex:
+            raise WiserScheduleError(f"Error restoring schedules from file - {ex}")
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def restore(entry: dict) -> _WiserScheduleRestoreResult:
+            result = _WiserScheduleRestoreResult(
+                entry.get("id"), entry.get("Name"), entry.get("SubType")
+            )
+            schedule = self._get_archive_schedule(entry)
+            if not schedule:
+                async with semaphore:
+                    try:
+                        schedule_data = entry.get("ScheduleData", {})
+                        await self.create_schedule(
+                            WiserScheduleTypeEnum(entry.get("SubType")),
+                            entry.get("Name"),
+                            entry.get("Assignments", []) if restore_assignments else [],
+                            schedule_data,
+                        )
+                        # Id of new schedule is not known until schedules are read
+                        result.schedule_id = None
+                        result.written = True
+                        result.days = [
+                            day.title()
+                            for day in schedule_data
+                            if day.title() in WEEK_DAYS
+                        ]
+                        result.assignments_updated = bool(
+                            restore_assignments and entry.get("Assignments")
+                        )
+                    except Exception as ex:
+                        result.error = f"Error creating schedule - {ex}"
+                return result
+            result.schedule_id = schedule.id
+            async with semaphore:
+                try:
+                    write_result = await schedule.set_schedule(
+                        dict(entry.get("ScheduleData", {}))
+                    )
+                    result.written = write_result.written
+                    result.days = write_result.days
+
+                    # Hot water schedule cannot be reassigned
+                    assignments = entry.get("Assignments", [])
+                    if (
+                        restore_assignments
+                        and schedule.id != 1000
+                        and set(assignments) != set(schedule.assignment_ids)
+                    ):
+                        await schedule.assign_schedule(assignments, False)
+                        result.assignments_updated = True
+                except Exception as ex:
+                    result.error = str(ex)
+            return result
+
+        entries = archive.get("Schedules", [])
+        results = await asyncio.gather(*[restore(entry) for entry in entries])
+
+        if verify:
+            try:
+                hub_schedules = await self._wiser_rest_controller.get_hub_data(
+                    WISERHUBSCHEDULES
+                )
+            except Exception as ex:
+                _LOGGER.warning("Unable to verify restored schedules - %s", ex)
+                hub_schedules = None
+
+            if hub_schedules is not None:
+                for entry, result in zip(entries, results):
+                    if result.error:
+                        continue
+                    # Created schedules are found by name
+                    hub_data = next(
+                        (
+                            hub_schedule
+                            for hub_schedule in hub_schedules.get(entry.get("Type"), [])
+                            if hub_schedule.get("id") == result.schedule_id
+                            or (
+                                result.schedule_id is None
+                                and hub_schedule.get("Name") == entry.get("Name")
+                            )
+                        ),
+                        None,
+                    )
+                    if hub_data is None:
+                        result.verified = False
+                        continue
+                    result.schedule_id = hub_data.get("id")
+                    schedule = self._new_schedule(entry.get("Type"), hub_data)
+                    result.verified = schedule._day_hashes(
+                        hub_data
+                    ) == schedule._day_hashes(entry.get("ScheduleData", {}))
+        return results
+
+    def find_duplicate_schedules(
+        self, schedule_type: WiserScheduleTypeEnum | None = None
+    ) -> list[
+        list[_WiserHeatingSchedule | _WiserLevelSchedule | _WiserOnOffSchedule]
+    ]:
+        """
+        Find groups of schedules of the same type with identical content
+        The schedule best suited to keep is first in each group
+        (most assignments, then lowest id).  The hot water schedule is never
+        included as other devices must not be assigned to it
+        param schedule_type: optional - only check schedules of this type
+        return: list of lists of _WiserSchedule objects
+        """
+        schedules = self.get_by_type(schedule_type) if schedule_type else self.all
+        groups = {}
+        for schedule in schedules:
+            if schedule.id == 1000:
+                continue
+            groups.setdefault(
+                (schedule.schedule_type, schedule.schedule_hash), []
+            ).append(schedule)
+
+        return [
+            sorted(
+                group,
+                key=lambda schedule: (
+                    -len(schedule.assignment_ids),
+                    schedule.id,
+                ),
+            )
+            for group in groups.values()
+            if len(group) > 1
+        ]
+
+    async def consolidate_schedules(
+        self,
+        schedules: list[
+            _WiserHeatingSchedule | _WiserLevelSchedule | _WiserOnOffSchedule
+        ],
+        keep_id: int | None = None,
+    ) -> _WiserScheduleConsolidationResult:
+        """
+        Move all assignments of a group of duplicate schedules onto one schedule
+        and delete the others
+        param schedules: group of schedules as returned by find_duplicate_schedules
+        param keep_id: optional - id of schedule to keep, defaults to first in group
+        return: _WiserScheduleConsolidationResult
+        """
+        if len(schedules) < 2:
+            raise WiserScheduleError("At least 2 schedules are needed to consolidate")
+        if len({schedule.schedule_type for schedule in schedules}) > 1 or len(
+            {schedule.schedule_hash for schedule in schedules}
+        ) > 1:
+            raise WiserScheduleError(
+                "Only schedules of the same type with identical content can be consolidated"
+            )
+
+        keep = next(
+            (schedule for schedule in schedules if schedule.id == keep_id),
+            schedules[0] if keep_id is None else None,
+        )
+        if not keep:
+            raise WiserScheduleError(f"Schedule id {keep_id} is not in this group")
+        if any(schedule.id == 1000 for schedule in schedules):
+            raise WiserScheduleError(
+                "The schedule for HotWater cannot be consolidated"
+            )
+        redundant = [schedule for schedule in schedules if schedule is not keep]
+
+        result = _WiserScheduleConsolidationResult(
+            keep.id, keep.schedule_type, list(keep.assignment_ids)
+        )
+        moved_ids = [
+            assignment_id
+            for schedule in redundant
+            for assignment_id in schedule.assignment_ids
+            if assignment_id not in result.assignment_ids
+        ]
+        if moved_ids:
+            await keep.assign_schedule(moved_ids)
+            result.assignment_ids.extend(moved_ids)
+
+        for schedule in redundant:
+            await schedule.delete_schedule()
+            result.deleted_ids.append(schedule.id)
+            for schedules_list in [
+                self._heating_schedules,
+                self._onoff_schedules,
+                self._level_schedules,
+            ]:
+                if schedule in schedules_list:
+                    schedules_list.remove(schedule)
+        return result
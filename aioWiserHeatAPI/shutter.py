@@ -1,5 +1,3 @@
-import inspect
-
 from . import _LOGGER
 from .const import (
     TEXT_UNKNOWN,
@@ -8,6 +6,7 @@ from .const import (
     WiserShutterAwayActionEnum,
 )
 from .helpers.device import _WiserElectricalDevice
+from .helpers.tracing import caller_name
 
 
 class _WiserLiftMovementRange(object):
@@ -114,11 +113,7 @@ class _WiserShutter(_WiserElectricalDevice):
             if result:
                 self._device_type_data = result
         if result:
-            _LOGGER.debug(
-                "Wiser shutter - {} command successful".format(
-                    inspect.stack()[1].function
-                )
-            )
+            _LOGGER.debug("Wiser shutter - %s command successful", caller_name())
             return True
         return False
 
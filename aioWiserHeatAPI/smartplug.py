@@ -60,6 +60,10 @@ class _WiserSmartPlug(_WiserElectricalDevice):
         Turn on the smart plug
         return: boolean
         """
+        if self._wiser_rest_controller._suppress_command(
+            self.is_on, f"{self.name} turn_on"
+        ):
+            return True
         result = await self._send_command({"RequestOutput": TEXT_ON})
         if result:
             self._output_state = TEXT_ON
@@ -70,6 +74,10 @@ class _WiserSmartPlug(_WiserElectricalDevice):
         Turn off the smart plug
         return: boolean
         """
+        if self._wiser_rest_controller._suppress_command(
+            not self.is_on, f"{self.name} turn_off"
+        ):
+            return True
         result = await self._send_command({"RequestOutput": TEXT_OFF})
         if result:
             self._output_state = TEXT_OFF
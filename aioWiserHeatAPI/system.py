@@ -1,4 +1,3 @@
-import inspect
 from datetime import datetime
 
 from . import _LOGGER
@@ -15,6 +14,7 @@ from .helpers.opentherm import _WiserOpentherm
 from .helpers.signal import _WiserSignalStrength
 from .helpers.special_times import sunrise_times, sunset_times
 from .helpers.temp import _WiserTemperatureFunctions as tf
+from .helpers.tracing import caller_name
 from .helpers.zigbee import _WiserZigbee
 from .rest_controller import _WiserRestController
 
@@ -58,6 +58,18 @@ class _WiserSystem(object):
         self._upgrade_data = _WiserFirmareUpgradeInfo(self._data.get("UpgradeInfo", {}))
         self._zigbee_data = _WiserZigbee(self._data.get("Zigbee", {}))
 
+        self._update_system_data()
+
+    def _update_opentherm(self, opentherm_data: dict):
+        """Set opentherm info from opentherm data read after system was built"""
+        self._opentherm_data = _WiserOpentherm(
+            self._wiser_rest_controller,
+            opentherm_data,
+            self._system_data.get("OpenThermConnectionStatus", TEXT_UNKNOWN),
+        )
+
+    def _update_system_data(self):
+        """Set settable values from system data"""
         # Variables to hold values for settabel values
         self._automatic_daylight_saving = self._system_data.get(
             "AutomaticDaylightSaving"
@@ -112,10 +124,12 @@ class _WiserSystem(object):
             )
         else:
             result = await self._wiser_rest_controller._send_command(WISERSYSTEM, cmd)
+            if isinstance(result, dict) and "UnixTime" in result:
+                # Apply updated system returned by hub so changes show without a poll
+                self._system_data.update(result)
+                self._update_system_data()
         if result:
-            _LOGGER.debug(
-                "Wiser hub - {} command successful".format(inspect.stack()[1].function)
-            )
+            _LOGGER.debug("Wiser hub - %s command successful", caller_name())
             return True
         return False
 
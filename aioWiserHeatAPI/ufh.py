@@ -1,5 +1,3 @@
-import inspect
-
 from . import _LOGGER
 from .const import (
     TEMP_MAXIMUM,
@@ -10,6 +8,7 @@ from .const import (
 )
 from .helpers.device import _WiserDevice
 from .helpers.temp import _WiserTemperatureFunctions as tf
+from .helpers.tracing import caller_name
 from .rest_controller import _WiserRestController
 
 
@@ -57,11 +56,7 @@ class _WiserUFHController(_WiserDevice):
                 WISERUFHCONTROLLER.format(self.id), cmd
             )
         if result:
-            _LOGGER.debug(
-                "Wiser UFH Controller - {} command successful".format(
-                    inspect.stack()[1].function
-                )
-            )
+            _LOGGER.debug("Wiser UFH Controller - %s command successful", caller_name())
         return result
 
     @property
@@ -12,10 +12,15 @@ https://github.com/asantaga/wiserheatingapi
 This API allows you to get information from and control your wiserhub.
 """
 
+import asyncio
 import pathlib
+from collections.abc import Callable
+from contextlib import suppress
 from datetime import datetime
 from typing import Any, Optional
 
+from zeroconf.asyncio import AsyncZeroconf
+
 from aioWiserHeatAPI.helpers.version import Version
 
 from . import __VERSION__, _LOGGER
@@ -23,9 +28,14 @@ from .cli import log_response_to_file
 from .const import (
     DEFAULT_AWAY_MODE_TEMP,
     DEFAULT_DEGRADED_TEMP,
+    HUB_COLLECTION_ENDPOINTS,
+    HUB_ENDPOINTS,
     HUB_GEN2_MIN_HTTPS_VERSION,
     MAX_BOOST_INCREASE,
     OPENTHERMV2_MIN_VERSION,
+    POLL_INTERVAL,
+    POLL_MAX_INTERVAL,
+    POLL_MIN_INTERVAL,
     TEMP_ERROR,
     TEMP_HW_OFF,
     TEMP_HW_ON,
@@ -39,6 +49,7 @@ from .const import (
     WISERHUBSCHEDULES,
     WISERHUBSTATUS,
     WISERHUBURL,
+    WISERROOM,
     WiserUnitsEnum,
 )
 from .devices import _WiserDeviceCollection
@@ -49,8 +60,20 @@ from .exceptions import (
     WiserScheduleError,
 )
 from .heating import _WiserHeatingChannelCollection
-from .helpers.automations import _WiserHeatingChannelAutomations
+from .helpers.command_journal import _WiserJournalCommand
+from .helpers.energy import _WiserEnergyAccumulator
+from .helpers.metrics import _WiserMetrics
+from .helpers.misc import run_in_executor
+from .helpers.poller import _WiserPoller
+from .helpers.recording import _WiserRecorder, _WiserReplayHub
+from .helpers.snapshot import _WiserSnapshot
+from .helpers.rules import (
+    WiserAutomationRule,
+    _WiserAutomationEngine,
+    _WiserPassiveModeRule,
+)
 from .helpers.status import WiserStatus
+from .helpers.tracing import _WiserTracer
 from .hot_water import _WiserHotwater
 from .moments import _WiserMomentCollection
 from .refactor import refactor
@@ -77,6 +100,9 @@ class WiserAPI:
         units: Optional[WiserUnitsEnum] = WiserUnitsEnum.metric,
         extra_config_file: Optional[str] = None,
         enable_automations: Optional[bool] = True,
+        command_journal_file: Optional[str] = None,
+        aiozc: Optional[AsyncZeroconf] = None,
+        snapshot_file: Optional[str] = None,
     ):
         # Connection variables
         self._wiser_api_connection = _WiserConnectionInfo()
@@ -89,6 +115,8 @@ class WiserAPI:
         self._wiser_api_connection.units = units
         self._wiser_api_connection.extra_config_file = extra_config_file
         self._wiser_api_connection.enable_automations = enable_automations
+        self._wiser_api_connection.command_journal_file = command_journal_file
+        self._wiser_api_connection.aiozc = aiozc
 
         # Hub Data
         self._domain_data = {}
@@ -110,9 +138,35 @@ class WiserAPI:
         self._extra_config_file = extra_config_file
         self._extra_config = None
 
+        # Last good hub data to build objects from at startup
+        self._snapshot = _WiserSnapshot(snapshot_file) if snapshot_file else None
+        self._stale = False
+        self._refresh_task: asyncio.Task | None = None
+
+        # Energy history of metering devices built from each poll
+        self._energy = _WiserEnergyAccumulator()
+
+        # Only one read of hub data at a time
+        self._poll_lock = asyncio.Lock()
+        self._poller: _WiserPoller | None = None
+
+        # Set as each object collection is first built
+        self._ready = {
+            collection: asyncio.Event() for collection in HUB_COLLECTION_ENDPOINTS
+        }
+
+        # Automation rules
+        self._automation_engine = _WiserAutomationEngine()
+        self._automation_engine.register(_WiserPassiveModeRule())
+
         # Log initialisation info
         _LOGGER.info(
-            f"WiserHub API v{__VERSION__} Initialised - Host: {host}, Units: {self._wiser_api_connection.units.name.title()}, Extra Config: {self._extra_config_file}, Automations: {self._enable_automations}"
+            "WiserHub API v%s Initialised - Host: %s, Units: %s, Extra Config: %s, Automations: %s",
+            __VERSION__,
+            host,
+            self._wiser_api_connection.units.name.title(),
+            self._extra_config_file,
+            self._enable_automations,
         )
 
         if (
@@ -130,15 +184,199 @@ class WiserAPI:
 
     async def read_hub_data(self):
         """Update data objects form the hub."""
-        await self._build_objects()
-
-        # Run automations
-        if self._enable_automations:
-            automations = _WiserHeatingChannelAutomations(
-                self._wiser_rest_controller, self.heating_channels
-            )
-            if await automations.run_automations():
+        # Wait for any read in progress so polls never overlap
+        async with self._poll_lock:
+            await self._read_hub_data()
+
+    async def _read_hub_data(self):
+        metrics = self._wiser_rest_controller.metrics
+        requests = metrics.counter("requests")
+        with metrics.timed("poll"), self.tracer.span("poll") as span:
+            if self._ready["rooms"].is_set():
                 await self._build_objects()
+            else:
+                await self._build_objects_progressively()
+
+            # Run automations with changed dependencies
+            if self._enable_automations:
+                with metrics.timed("automations"):
+                    updated_room_ids = await self._automation_engine.run(self)
+                    if updated_room_ids:
+                        span.set_attribute("updated_rooms", sorted(updated_room_ids))
+                        # Only re-read rooms changed by automations
+                        await self._refresh_rooms(updated_room_ids)
+                        self._automation_engine.update_snapshot(self)
+
+        self._stale = False
+        self._update_energy()
+        if self._snapshot:
+            await self._snapshot.async_save(self._snapshot_data())
+
+        # Hub is reachable so send any commands queued during an outage
+        await self._wiser_rest_controller.replay_commands()
+        metrics.record("poll_requests", metrics.counter("requests") - requests)
+
+    async def warm_start(self) -> bool:
+        """
+        Build objects from the saved snapshot and read hub data in the
+        background.  Data is marked as stale until the hub has been read.
+        Reads hub data as normal if there is no snapshot
+        return: boolean - true = objects built from snapshot
+        """
+        data = await self._snapshot.async_load() if self._snapshot else None
+        if not data:
+            await self.read_hub_data()
+            return False
+
+        self._domain_data = data.get("domain", {})
+        self._network_data = data.get("network", {})
+        self._schedule_data = data.get("schedule", {})
+        self._opentherm_data = data.get("opentherm", {})
+        self._status_data = data.get("status", {})
+        self._update_hub_name()
+        self._wiser_rest_controller._extra_config_file = self._extra_config_file
+        await self._wiser_rest_controller.get_extra_config_data()
+        await self._async_create_objects()
+        self._set_ready(*HUB_COLLECTION_ENDPOINTS)
+        self._stale = True
+        _LOGGER.debug(
+            "Built objects from snapshot saved at %s", self._snapshot.created
+        )
+
+        self._refresh_task = asyncio.create_task(self._refresh_stale_data())
+        return True
+
+    def start_polling(
+        self,
+        interval: float = POLL_INTERVAL,
+        min_interval: float = POLL_MIN_INTERVAL,
+        max_interval: float = POLL_MAX_INTERVAL,
+    ) -> _WiserPoller:
+        """
+        Read hub data in the background.  Polls are made every min interval
+        after commands or changes and back off to max interval when nothing
+        changes or the hub cannot be read
+        param interval: seconds between first polls
+        param min_interval: least seconds between polls
+        param max_interval: most seconds between polls
+        return: poller to add listeners to
+        """
+        if self._poller and self._poller.running:
+            return self._poller
+        self._poller = _WiserPoller(self, interval, min_interval, max_interval)
+        self._wiser_rest_controller.poller = self._poller
+        self._poller.start()
+        return self._poller
+
+    async def stop_polling(self):
+        """Stop background polling.  Waits for any poll in progress"""
+        if self._poller:
+            await self._poller.stop()
+            self._wiser_rest_controller.poller = None
+
+    async def _refresh_stale_data(self):
+        try:
+            await self.read_hub_data()
+        except (
+            WiserHubConnectionError,
+            WiserHubAuthenticationError,
+            WiserHubRESTError,
+        ) as ex:
+            _LOGGER.warning("Unable to refresh data from Wiser hub. %s", ex)
+
+    def _update_energy(self):
+        """Add readings of metering devices to energy history"""
+        if not self._devices:
+            return
+        collections = [
+            self._devices.smartplugs,
+            self._devices.heating_actuators,
+            self._devices.power_tags,
+            self._devices.power_tags_c,
+        ]
+        self._energy.update(
+            [
+                device
+                for collection in collections
+                if collection
+                for device in collection.all
+            ],
+            self._domain_data.get("System", {}).get("UnixTime"),
+        )
+
+    def _snapshot_data(self) -> dict[str, dict]:
+        return {
+            "domain": self._domain_data,
+            "network": self._network_data,
+            "schedule": self._schedule_data,
+            "opentherm": self._opentherm_data,
+            "status": self._status_data,
+        }
+
+    async def close(self):
+        """Write any pending changes.  Call before discarding this instance"""
+        await self.stop_polling()
+        if refresh_task := self._refresh_task:
+            self._refresh_task = None
+            refresh_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await refresh_task
+        if self._snapshot and self._domain_data and not self._stale:
+            await self._snapshot.async_save(self._snapshot_data(), force=True)
+        await self._wiser_rest_controller.close()
+
+    async def replay_pending_commands(self) -> int:
+        """
+        Send commands queued while the hub was unavailable.  This is
+        done automatically after each successful poll
+        return: number of commands sent
+        """
+        return await self._wiser_rest_controller.replay_commands()
+
+    async def clear_pending_commands(self):
+        """Discard commands queued while the hub was unavailable"""
+        await self._wiser_rest_controller.clear_pending_commands()
+
+    async def start_recording(self, recording_file: str, anonymise: bool = True):
+        """
+        Record all hub requests and responses to a gzip json lines file
+        param recording_file: path of file.  Records are appended if it exists
+        param anonymise: replace personal data such as location and ip addresses
+        """
+        await self.stop_recording()
+        self._wiser_rest_controller.recorder = _WiserRecorder(
+            recording_file, anonymise
+        )
+
+    async def stop_recording(self):
+        """Stop recording hub requests and close recording file"""
+        if recorder := self._wiser_rest_controller.recorder:
+            self._wiser_rest_controller.recorder = None
+            await recorder.async_close()
+
+    def replay_recording(self, recording_file: str, speed: float = 1.0):
+        """
+        Answer requests with responses from a recording instead of the hub
+        param recording_file: path of recording made with start_recording
+        param speed: 1 replays at recorded speed, 2 twice as fast etc.
+        0 replays as fast as possible
+        """
+        self._wiser_rest_controller.transport = _WiserReplayHub(recording_file, speed)
+
+    def add_automation_rule(self, rule: WiserAutomationRule):
+        """
+        Add a user defined automation rule.  Rules are run after a poll
+        when any field they depend on has changed
+        param rule: instance of WiserAutomationRule subclass
+        """
+        self._automation_engine.register(rule)
+
+    def remove_automation_rule(self, name: str):
+        """
+        Remove an automation rule
+        param name: name of rule
+        """
+        self._automation_engine.unregister(name)
 
     async def get_hub_data(self) -> dict[str, Any]:
         """Get data from hub."""
@@ -158,60 +396,10 @@ class WiserAPI:
     async def _get_hub_data(self) -> bool:
         try:
             start_time = datetime.now()
-            self._domain_data = await self._wiser_rest_controller.get_hub_data(
-                WISERHUBDOMAIN
-            )
-
-            # Determine if we need to use https for v2 hubs.  FW needs to be 4.42.23 or higher
-            if self._domain_data:
-                hw_gen = self._domain_data.get("System", {}).get(
-                    "HardwareGeneration", 1
-                )
-                fw_version = Version(
-                    self._domain_data.get("System", {}).get(
-                        "ActiveSystemVersion", "1.0.0"
-                    )
-                )
-                _LOGGER.debug(
-                    "Hub Hardware Generation: %s, Firmware Version: %s",
-                    hw_gen,
-                    fw_version,
-                )
-                if hw_gen == 2 and fw_version >= HUB_GEN2_MIN_HTTPS_VERSION:
-                    _LOGGER.debug("Using HTTPS for Wiser Hub REST API calls")
-                    self._wiser_rest_controller.use_https = True
-
-            self._network_data = await self._wiser_rest_controller.get_hub_data(
-                WISERHUBNETWORK
-            )
-            self._schedule_data = await self._wiser_rest_controller.get_hub_data(
-                WISERHUBSCHEDULES
-            )
-            try:
-                self._status_data = await self._wiser_rest_controller.get_hub_data(
-                    WISERHUBSTATUS
-                )
-            except WiserHubRESTError:
-                self._status_data = {}
-
-            # Only get opentherm data if connected
-            opentherm = self._domain_data.get("System", {}).get(
-                "OpenThermConnectionStatus", ""
-            )
-            if opentherm and opentherm == "Connected" or True:
-                fw_version = Version(
-                    self._domain_data.get("System", {}).get(
-                        "ActiveSystemVersion", "1.0.0"
-                    )
-                )
-                hw_version = self._domain_data.get("System", {}).get(
-                    "HardwareGeneration", 1
-                )
-                self._opentherm_data = await self._wiser_rest_controller.get_hub_data(
-                    WISERHUBOPENTHERMV2
-                    if hw_version == 2 and fw_version >= OPENTHERMV2_MIN_VERSION
-                    else WISERHUBOPENTHERM,
-                    False,
+            await self._get_domain_data()
+            for endpoint in HUB_ENDPOINTS:
+                setattr(
+                    self, f"_{endpoint}_data", await self._get_endpoint_data(endpoint)
                 )
         except (
             WiserHubConnectionError,
@@ -222,12 +410,7 @@ class WiserAPI:
             _LOGGER.debug("Update from Wiser hub failed. %s", ex)
             raise ex
         else:
-            # Set hub name on rest controller
-            self._wiser_rest_controller._hub_name = (
-                self._network_data.get("Station", {})
-                .get("NetworkInterface", {})
-                .get("HostName", "")
-            )
+            self._update_hub_name()
 
             _LOGGER.debug(
                 "Update from %s successful and took %ss",
@@ -236,6 +419,102 @@ class WiserAPI:
             )
             return True
 
+    async def _get_domain_data(self):
+        """Read domain data from hub and set if https is needed"""
+        self._domain_data = await self._wiser_rest_controller.get_hub_data(
+            WISERHUBDOMAIN
+        )
+
+        # Determine if we need to use https for v2 hubs.  FW needs to be 4.42.23 or higher
+        if self._domain_data:
+            hw_gen = self._domain_data.get("System", {}).get("HardwareGeneration", 1)
+            fw_version = Version(
+                self._domain_data.get("System", {}).get("ActiveSystemVersion", "1.0.0")
+            )
+            _LOGGER.debug(
+                "Hub Hardware Generation: %s, Firmware Version: %s",
+                hw_gen,
+                fw_version,
+            )
+            if hw_gen == 2 and fw_version >= HUB_GEN2_MIN_HTTPS_VERSION:
+                _LOGGER.debug("Using HTTPS for Wiser Hub REST API calls")
+                self._wiser_rest_controller.use_https = True
+
+    async def _get_endpoint_data(self, endpoint: str) -> dict:
+        """
+        Read data of a hub endpoint other than domain.  Domain data must be read
+        first
+        param endpoint: one of HUB_ENDPOINTS
+        return: endpoint data
+        """
+        if endpoint == "network":
+            return await self._wiser_rest_controller.get_hub_data(WISERHUBNETWORK)
+        if endpoint == "schedule":
+            return await self._wiser_rest_controller.get_hub_data(WISERHUBSCHEDULES)
+        if endpoint == "status":
+            try:
+                return await self._wiser_rest_controller.get_hub_data(WISERHUBSTATUS)
+            except WiserHubRESTError:
+                return {}
+        if endpoint == "opentherm":
+            # Opentherm endpoint depends on hub generation and firmware
+            fw_version = Version(
+                self._domain_data.get("System", {}).get("ActiveSystemVersion", "1.0.0")
+            )
+            hw_version = self._domain_data.get("System", {}).get(
+                "HardwareGeneration", 1
+            )
+            return await self._wiser_rest_controller.get_hub_data(
+                WISERHUBOPENTHERMV2
+                if hw_version == 2 and fw_version >= OPENTHERMV2_MIN_VERSION
+                else WISERHUBOPENTHERM,
+                False,
+            )
+        raise ValueError(f"{endpoint} is not a valid hub endpoint")
+
+    def _update_hub_name(self):
+        """Set hub name on rest controller"""
+        self._wiser_rest_controller._hub_name = (
+            self._network_data.get("Station", {})
+            .get("NetworkInterface", {})
+            .get("HostName", "")
+        )
+        if self._wiser_rest_controller._resolver:
+            self._wiser_rest_controller._resolver.hub_name = (
+                self._wiser_rest_controller._hub_name
+            )
+
+    async def _refresh_rooms(self, room_ids: set[int]):
+        """
+        Re-read room data from hub and update room objects in place
+        Falls back to a full rebuild if a room cannot be refreshed and keeps
+        current objects if that fails too
+        param room_ids: ids of rooms to refresh
+        """
+        domain_rooms = self._domain_data.get("Room", [])
+        try:
+            for room_id in room_ids:
+                room_data = await self._wiser_rest_controller.get_hub_data(
+                    WISERHUBDOMAIN + WISERROOM.format(room_id)
+                )
+                room = self._rooms.get_by_id(room_id)
+                if not room_data or not room:
+                    raise WiserHubRESTError(f"Unable to refresh room {room_id}")
+                room._update(room_data)
+                for idx, domain_room in enumerate(domain_rooms):
+                    if domain_room.get("id") == room_id:
+                        domain_rooms[idx] = room_data
+                self._wiser_rest_controller.metrics.increment("room_refreshes")
+        except (WiserHubConnectionError, WiserHubRESTError) as ex:
+            _LOGGER.debug("%s. Rebuilding all objects", ex)
+            try:
+                await self._build_objects()
+            except (WiserHubConnectionError, WiserHubRESTError) as rebuild_ex:
+                # Objects from this poll are kept and are updated on next poll
+                _LOGGER.warning(
+                    "Unable to refresh rooms changed by automations. %s", rebuild_ex
+                )
+
     async def _build_objects(self):
         """Read all data from hub and populate objects"""
 
@@ -244,72 +523,12 @@ class WiserAPI:
             await self._get_hub_data()
 
             # load extra data
-            self._wiser_rest_controller._extra_config_file = self._extra_config_file
-            await self._wiser_rest_controller.get_extra_config_data()
-
-            if self._domain_data != {} and self._network_data != {}:
-                # System Object
-                _device_data = self._domain_data.get("Device", [])
-                self._system = _WiserSystem(
-                    self._wiser_rest_controller,
-                    self._domain_data,
-                    self._network_data,
-                    _device_data,
-                    self._opentherm_data,
-                )
-
-                # Schedules Collection
-                self._schedules = _WiserScheduleCollection(
-                    self._wiser_rest_controller,
-                    self._schedule_data,
-                    self._system.sunrise_times,
-                    self._system.sunset_times,
-                )
-
-                # Devices Collection
-                self._devices = _WiserDeviceCollection(
-                    self._wiser_rest_controller,
-                    self._domain_data,
-                    self._schedules,
-                )
-
-                # Rooms Collection
-                room_data = self._domain_data.get("Room", [])
-                self._rooms = _WiserRoomCollection(
-                    self._wiser_rest_controller,
-                    room_data,
-                    self._schedules.get_by_type(WiserScheduleTypeEnum.heating),
-                    self._devices,
-                    self._enable_automations,
-                )
-
-                # Hot Water
-                if self._domain_data.get("HotWater"):
-                    schedule = self._schedules.get_by_id(
-                        WiserScheduleTypeEnum.onoff,
-                        self._domain_data.get("HotWater")[0].get("ScheduleId", 0),
-                    )
-                    self._hotwater = _WiserHotwater(
-                        self._wiser_rest_controller,
-                        self._domain_data.get("HotWater", {})[0],
-                        schedule,
-                    )
-
-                # Heating Channels
-                if self._domain_data.get("HeatingChannel"):
-                    self._heating_channels = _WiserHeatingChannelCollection(
-                        self._domain_data.get("HeatingChannel"), self._rooms
-                    )
+            await self._load_extra_config()
 
-                # Moments
-                if self._domain_data.get("Moment"):
-                    self._moments = _WiserMomentCollection(
-                        self._wiser_rest_controller,
-                        self._domain_data.get("Moment"),
-                    )
-
-                # If gets here with no exceptions then success and return true
+            if await self._async_create_objects():
+                self._set_ready(*HUB_COLLECTION_ENDPOINTS)
                 return True
+            return False
         except (
             WiserHubConnectionError,
             WiserHubAuthenticationError,
@@ -318,7 +537,316 @@ class WiserAPI:
         ) as ex:
             raise ex
 
+    async def _build_objects_progressively(self) -> bool:
+        """
+        Read domain data, then read other endpoints concurrently.  Rooms,
+        devices, hot water, heating channels and moments are built from
+        domain data straight away.  The system is built when network data is
+        read and schedules are attached to the built objects when schedule
+        data is read.  Used for first read so objects are available without
+        waiting for the slowest endpoint
+        """
+        start_time = datetime.now()
+        await self._get_domain_data()
+        loaded = {"domain"}
+        built = self._set_objects(await self._async_build(self._build_domain_objects))
+        if built:
+            self._set_ready_for_endpoints(loaded)
+        system_built = schedules_built = False
+
+        tasks = {
+            asyncio.create_task(self._get_endpoint_data(endpoint)): endpoint
+            for endpoint in HUB_ENDPOINTS
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                done_endpoints = {tasks[task] for task in done}
+                for task in done:
+                    endpoint = tasks[task]
+                    setattr(self, f"_{endpoint}_data", task.result())
+                    loaded.add(endpoint)
+                    _LOGGER.debug("Read %s data from hub", endpoint)
+
+                if "network" in done_endpoints:
+                    # Extra config file is named from hub name
+                    self._update_hub_name()
+                    await self._load_extra_config()
+                    await self._update_extra_config_objects()
+
+                if not built:
+                    continue
+                if not system_built and "network" in loaded:
+                    system_built = self._set_objects(
+                        {"_system": self._build_system()}
+                    )
+                    self._rooms._system = self._system
+                elif system_built and "opentherm" in done_endpoints:
+                    self._system._update_opentherm(self._opentherm_data)
+
+                if system_built and not schedules_built and "schedule" in loaded:
+                    schedules = await self._async_build(self._build_schedules)
+                    self._attach_schedules(schedules)
+                    schedules_built = True
+                self._set_ready_for_endpoints(loaded)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        _LOGGER.debug(
+            "First read from %s took %ss",
+            self._wiser_rest_controller._hub_name,
+            (datetime.now() - start_time).total_seconds(),
+        )
+        return built and system_built and schedules_built
+
+    async def _load_extra_config(self):
+        self._wiser_rest_controller._extra_config_file = self._extra_config_file
+        await self._wiser_rest_controller.get_extra_config_data()
+
+    async def _update_extra_config_objects(self):
+        """Read extra config into objects built before it was loaded"""
+        for room in self._rooms.all if self._rooms else []:
+            await room._get_extra_config()
+        if self._hotwater:
+            await self._hotwater._get_extra_config()
+
+    def _attach_schedules(self, schedules: _WiserScheduleCollection):
+        """Add schedules to objects built before schedule data was read"""
+        self._schedules = schedules
+        self._devices._attach_schedules(schedules)
+        self._rooms._attach_schedules(
+            schedules.get_by_type(WiserScheduleTypeEnum.heating)
+        )
+        if self._hotwater:
+            self._hotwater._attach_schedule(
+                schedules.get_by_id(
+                    WiserScheduleTypeEnum.onoff, self._hotwater._data.get("ScheduleId", 0)
+                )
+            )
+
+    def _set_ready(self, *collections: str):
+        for collection in collections:
+            self._ready[collection].set()
+
+    def _set_ready_for_endpoints(self, endpoints: set[str]):
+        """Set collections ready whose endpoints have all been read"""
+        self._set_ready(
+            *[
+                collection
+                for collection, collection_endpoints in HUB_COLLECTION_ENDPOINTS.items()
+                if endpoints.issuperset(collection_endpoints)
+            ]
+        )
+
+    async def _async_create_objects(self) -> bool:
+        """Populate objects from hub data"""
+        return self._set_objects(await self._async_build(self._build_objects_from_data))
+
+    async def _async_build(self, build: Callable[[], Any]) -> Any:
+        """
+        Build objects from hub data.  Built in an executor if build offload
+        is enabled, otherwise time the event loop is blocked is recorded
+        param build: function building objects without replacing current ones
+        return: result of build
+        """
+        if self._wiser_rest_controller._api_parameters.offload_build:
+            self.metrics.increment("offloaded_builds")
+            return await run_in_executor(build)
+        with self.metrics.timed("loop_blocked"):
+            return build()
+
+    def _set_objects(self, objects: dict[str, Any] | None) -> bool:
+        """
+        Replace objects with newly built ones.  Done on the event loop so
+        objects are never replaced while in use by other coroutines
+        """
+        if not objects:
+            return False
+        for name, value in objects.items():
+            setattr(self, name, value)
+        return True
+
+    def _build_objects_from_data(self) -> dict[str, Any] | None:
+        """
+        Build objects from hub data without replacing current objects.  Safe
+        to run in an executor as only newly read hub data is used
+        return: dict of attribute name and object, or None if no hub data
+        """
+        if self._domain_data != {} and self._network_data != {}:
+            with self._wiser_rest_controller.tracer.span(
+                "build",
+                rooms=len(self._domain_data.get("Room", [])),
+                devices=len(self._domain_data.get("Device", [])),
+            ):
+                system = self._build_system()
+                schedules = self._build_schedules(system)
+                objects = {"_system": system, "_schedules": schedules}
+                objects.update(self._build_collections(schedules, system))
+
+                # If gets here with no exceptions then success
+                return objects
+        return None
+
+    def _build_domain_objects(self) -> dict[str, Any] | None:
+        """
+        Build objects that only need domain data, without schedules.  Used
+        on first read before other endpoints are read
+        return: dict of attribute name and object, or None if no domain data
+        """
+        if self._domain_data != {}:
+            with self._wiser_rest_controller.tracer.span(
+                "build",
+                rooms=len(self._domain_data.get("Room", [])),
+                devices=len(self._domain_data.get("Device", [])),
+            ):
+                return self._build_collections(
+                    _WiserScheduleCollection(self._wiser_rest_controller, {}, [], [])
+                )
+        return None
+
+    def _build_system(self) -> _WiserSystem:
+        """Build system object from domain, network and opentherm data"""
+        return _WiserSystem(
+            self._wiser_rest_controller,
+            self._domain_data,
+            self._network_data,
+            self._domain_data.get("Device", []),
+            self._opentherm_data,
+        )
+
+    def _build_schedules(
+        self, system: _WiserSystem | None = None
+    ) -> _WiserScheduleCollection:
+        """Build schedules collection from schedule data"""
+        system = system or self._system
+        return _WiserScheduleCollection(
+            self._wiser_rest_controller,
+            self._schedule_data,
+            system.sunrise_times,
+            system.sunset_times,
+        )
+
+    def _build_collections(
+        self,
+        schedules: _WiserScheduleCollection,
+        system: _WiserSystem | None = None,
+    ) -> dict[str, Any]:
+        """
+        Build device, room, hot water, heating channel and moment objects
+        from domain data
+        """
+        objects = {}
+
+        # Devices Collection
+        devices = objects["_devices"] = _WiserDeviceCollection(
+            self._wiser_rest_controller,
+            self._domain_data,
+            schedules,
+        )
+
+        # Rooms Collection
+        room_data = self._domain_data.get("Room", [])
+        rooms = objects["_rooms"] = _WiserRoomCollection(
+            self._wiser_rest_controller,
+            room_data,
+            schedules.get_by_type(WiserScheduleTypeEnum.heating),
+            devices,
+            self._enable_automations,
+            system,
+        )
+
+        # Hot Water
+        if self._domain_data.get("HotWater"):
+            schedule = schedules.get_by_id(
+                WiserScheduleTypeEnum.onoff,
+                self._domain_data.get("HotWater")[0].get("ScheduleId", 0),
+            )
+            objects["_hotwater"] = _WiserHotwater(
+                self._wiser_rest_controller,
+                self._domain_data.get("HotWater", {})[0],
+                schedule,
+            )
+
+        # Heating Channels
+        if self._domain_data.get("HeatingChannel"):
+            objects["_heating_channels"] = _WiserHeatingChannelCollection(
+                self._domain_data.get("HeatingChannel"), rooms
+            )
+
+        # Moments
+        if self._domain_data.get("Moment"):
+            objects["_moments"] = _WiserMomentCollection(
+                self._wiser_rest_controller,
+                self._domain_data.get("Moment"),
+            )
+        return objects
+
     # API properties
+    @property
+    def automation_rules(self) -> list[WiserAutomationRule]:
+        """List of registered automation rules"""
+        return self._automation_engine.rules
+
+    @property
+    def pending_commands(self) -> list[_WiserJournalCommand]:
+        """List of commands queued while the hub was unavailable"""
+        return self._wiser_rest_controller.pending_commands
+
+    @property
+    def poller(self) -> _WiserPoller | None:
+        """Background poller if polling has been started"""
+        return self._poller
+
+    @property
+    def energy(self) -> _WiserEnergyAccumulator:
+        """Interval energy and power history of metering devices"""
+        return self._energy
+
+    @property
+    def metrics(self) -> _WiserMetrics:
+        """Request and poll timing metrics"""
+        return self._wiser_rest_controller.metrics
+
+    @property
+    def ready(self) -> dict[str, bool]:
+        """
+        Which object collections have been built from all the hub data they
+        use.  Rooms, devices and hot water are ready before schedules on
+        first read
+        """
+        return {
+            collection: event.is_set() for collection, event in self._ready.items()
+        }
+
+    async def wait_until_ready(self, *collections: str, timeout: float | None = None):
+        """
+        Wait until object collections are ready
+        param collections: names of collections as in ready.  All if none given
+        param timeout: seconds to wait.  Raises TimeoutError if exceeded
+        """
+        async with asyncio.timeout(timeout):
+            for collection in collections or self._ready:
+                await self._ready[collection].wait()
+
+    @property
+    def stale(self) -> bool:
+        """Data was loaded from snapshot and hub has not been read yet"""
+        return self._stale
+
+    @property
+    def snapshot_time(self) -> datetime | None:
+        """Time last snapshot was saved or loaded"""
+        return self._snapshot.created if self._snapshot else None
+
+    @property
+    def tracer(self) -> _WiserTracer:
+        """Tracer to export timing spans of polls, requests and commands"""
+        return self._wiser_rest_controller.tracer
+
     @property
     def api_parameters(self):
         """Rest control api parameters."""